@@ -1,8 +1,73 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from attendance.models import User, Attendance, OfficeLocation
+from attendance.models import User, Attendance, OfficeLocation, DailyAttendanceSummary, ReportJob, \
+    Notification, Shift, Schedule, ExpectedPresence, InactivePeriod, RetentionCutoff
+from attendance.pagination import EstimatedCountPaginator
+from attendance.punches import correct_attendance
+from attendance.schedules import expected_checkout
 
-admin.site.register(User)
-admin.site.register(Attendance)
 
-admin.site.register(OfficeLocation)
\ No newline at end of file
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    list_display = ('username', 'first_name', 'last_name', 'email', 'role', 'is_active')
+    list_filter = ('role', 'is_active', 'is_staff', 'groups')
+    readonly_fields = ('token_version',)
+    fieldsets = BaseUserAdmin.fieldsets + (("Attendance", {'fields': ('role', 'token_version')}),)
+    add_fieldsets = BaseUserAdmin.add_fieldsets + (("Attendance", {'fields': ('role',)}),)
+    show_full_result_count = False
+
+
+@admin.register(Attendance)
+class AttendanceAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'work_date', 'checkin_time', 'checkout_time', 'office', 'auto_closed')
+    list_select_related = ('employee', 'office')
+    date_hierarchy = 'work_date'
+    # Matches attendance_day_employee_idx, so pages are read in index order
+    ordering = ('-work_date', '-employee')
+    list_filter = ('office',)
+    autocomplete_fields = ('employee',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ('close_open_sessions', 'clear_checkout')
+
+    @admin.action(description="Close open sessions at the end of their shift")
+    def close_open_sessions(self, request, queryset):
+        keys = correct_attendance(
+            queryset.filter(checkin_time__isnull=False, checkout_time__isnull=True),
+            checkout_time=expected_checkout(),
+        )
+        self.message_user(request, f"Closed {len(keys)} open sessions.", messages.SUCCESS)
+
+    @admin.action(description="Clear check-out time")
+    def clear_checkout(self, request, queryset):
+        keys = correct_attendance(queryset.filter(checkout_time__isnull=False), checkout_time=None, auto_closed=False)
+        self.message_user(request, f"Cleared the check-out of {len(keys)} records.", messages.SUCCESS)
+
+
+@admin.register(Schedule)
+class ScheduleAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'shift', 'weekdays', 'valid_from', 'valid_until')
+    list_select_related = ('employee', 'shift')
+    list_filter = ('shift',)
+    autocomplete_fields = ('employee',)
+
+
+@admin.register(ExpectedPresence)
+class ExpectedPresenceAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'work_date', 'shift', 'start', 'end')
+    list_select_related = ('employee', 'shift')
+    date_hierarchy = 'work_date'
+    ordering = ('-work_date',)
+    list_filter = ('shift',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+admin.site.register(Shift)
+admin.site.register(OfficeLocation)
+admin.site.register(DailyAttendanceSummary)
+admin.site.register(ReportJob)
+admin.site.register(Notification)
+admin.site.register(InactivePeriod)
+admin.site.register(RetentionCutoff)
@@ -0,0 +1,165 @@
+from datetime import date, datetime
+
+import numpy as np
+from django.conf import settings
+from django.db.models import FloatField, Func
+from django.utils import timezone
+
+from .models import Attendance, ExpectedPresence, User
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+
+class Epoch(Func):
+    """Seconds since the Unix epoch as a float, so rows arrive without Python datetime parsing."""
+    template = "date_part('epoch', %(expressions)s)"
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="(julianday(%(expressions)s) - 2440587.5) * 86400.0", **extra_context
+        )
+
+
+def load_attendance_columns(start_date, end_date):
+    """
+    Reads the attendance of the range with one query and returns it as
+    column arrays: employee ids, then work dates, check-in and check-out
+    times as epoch seconds (``nan`` where missing).
+    """
+    rows = (
+        Attendance.objects
+        .filter(work_date__range=(start_date, end_date))
+        .values_list('employee_id', Epoch('work_date'), Epoch('checkin_time'), Epoch('checkout_time'))
+    )
+    columns = np.array(list(rows), dtype=np.float64).reshape(-1, 4)
+    # Millisecond precision is plenty and hides float noise from SQLite's julianday()
+    times = columns[:, 1:].round(3)
+    return columns[:, 0].astype(np.int64), times[:, 0], times[:, 1], times[:, 2]
+
+
+def load_shift_bounds(employee_ids, work_dates, start_date, end_date):
+    """
+    Returns the start and end of the shift instance of each attendance row as
+    epoch seconds, ``nan`` where the row has none, reading the calendar of
+    the range with one query and matching it with a sorted search.
+    """
+    calendar = np.array(
+        list(ExpectedPresence.objects.filter(work_date__range=(start_date, end_date)).values_list(
+            'employee_id', Epoch('work_date'), Epoch('start'), Epoch('end')
+        )),
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    starts = np.full(len(employee_ids), np.nan)
+    ends = np.full(len(employee_ids), np.nan)
+    if not len(calendar) or not len(employee_ids):
+        return starts, ends
+
+    # One sortable key per (employee, day)
+    keys = employee_ids * 100000 + np.round(work_dates / SECONDS_PER_DAY)
+    calendar_keys = calendar[:, 0] * 100000 + np.round(calendar[:, 1] / SECONDS_PER_DAY)
+    order = np.argsort(calendar_keys)
+    positions = np.searchsorted(calendar_keys[order], keys).clip(max=len(order) - 1)
+    found = calendar_keys[order][positions] == keys
+    rows = order[positions[found]]
+    starts[found] = calendar[rows, 2].round(3)
+    ends[found] = calendar[rows, 3].round(3)
+    return starts, ends
+
+
+def local_seconds(epoch_seconds):
+    """Converts UTC epoch seconds to seconds on the local wall clock of ``TIME_ZONE``."""
+    # Imported here to keep pandas out of process startup
+    import pandas as pd
+
+    times = pd.to_datetime(epoch_seconds, unit='s', utc=True).tz_convert(settings.TIME_ZONE).tz_localize(None)
+    return times.asi8 / 1e9
+
+
+def timesheet_analytics(start_date, end_date, shift_start=None):
+    """
+    Per-employee worked hours, late arrivals, missing checkouts and overtime
+    for the range, computed with array operations over all rows at once.
+    Rows with a scheduled shift instance are measured against it, others
+    against ``ATTENDANCE_SHIFT_START`` and ``ATTENDANCE_STANDARD_DAY``; a
+    ``shift_start`` override applies to every row.
+    """
+    employee_ids, work_dates, checkins, checkouts = load_attendance_columns(start_date, end_date)
+    if shift_start is None:
+        shift_starts, shift_ends = load_shift_bounds(employee_ids, work_dates, start_date, end_date)
+    else:
+        shift_starts = shift_ends = np.full(len(employee_ids), np.nan)
+    shift_start = shift_start or settings.ATTENDANCE_SHIFT_START
+    scheduled = ~np.isnan(shift_starts)
+
+    # Rows kept by the work_date migration may have a check-out but no check-in
+    has_checkin = ~np.isnan(checkins)
+    has_checkout = ~np.isnan(checkouts)
+    complete = has_checkin & has_checkout
+    worked = np.where(complete, checkouts - checkins, 0.0).clip(min=0)
+
+    # Seconds past the shift start on the wall clock of the work day
+    shift_offset = shift_start.hour * 3600 + shift_start.minute * 60 + shift_start.second
+    late_seconds = np.where(scheduled, checkins - shift_starts, local_seconds(checkins) - (work_dates + shift_offset))
+    late = has_checkin & (late_seconds > settings.ATTENDANCE_LATE_GRACE.total_seconds())
+
+    expected_seconds = np.where(scheduled, shift_ends - shift_starts, settings.ATTENDANCE_STANDARD_DAY.total_seconds())
+    overtime = np.where(complete, worked - expected_seconds, 0.0).clip(min=0)
+    # Today's open session is still running, it is not a missing checkout yet
+    today = (timezone.localdate() - date(1970, 1, 1)).days * SECONDS_PER_DAY
+    missing = ~has_checkout & (work_dates < today)
+
+    ids, groups = np.unique(employee_ids, return_inverse=True)
+    count = len(ids)
+    days = np.bincount(groups, minlength=count)
+    worked_total = np.bincount(groups, weights=worked, minlength=count)
+    checked_out_days = np.bincount(groups, weights=complete, minlength=count)
+    late_days = np.bincount(groups, weights=late, minlength=count)
+    late_total = np.bincount(groups, weights=np.where(late, late_seconds, 0.0), minlength=count)
+    missing_total = np.bincount(groups, weights=missing, minlength=count)
+    overtime_total = np.bincount(groups, weights=overtime, minlength=count)
+    average = np.divide(worked_total, checked_out_days, out=np.zeros(count), where=checked_out_days > 0)
+
+    names = {
+        user_id: f"{first_name} {last_name}".strip()
+        for user_id, first_name, last_name in User.objects.filter(id__in=ids.tolist()).values_list(
+            'id', 'first_name', 'last_name'
+        )
+    }
+    employees = [
+        {
+            "employee_id": employee_id,
+            "employee": names.get(employee_id, ''),
+            "days_present": int(days[index]),
+            "worked_hours": round(worked_total[index] / SECONDS_PER_HOUR, 2),
+            "average_hours": round(average[index] / SECONDS_PER_HOUR, 2),
+            "late_days": int(late_days[index]),
+            "late_minutes": round(late_total[index] / 60, 1),
+            "missing_checkouts": int(missing_total[index]),
+            "overtime_hours": round(overtime_total[index] / SECONDS_PER_HOUR, 2),
+        }
+        for index, employee_id in enumerate(ids.tolist())
+    ]
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "shift_start": shift_start.strftime('%H:%M'),
+        "totals": {
+            "employees": count,
+            "records": len(employee_ids),
+            "worked_hours": round(float(worked.sum()) / SECONDS_PER_HOUR, 2),
+            "late_arrivals": int(late.sum()),
+            "missing_checkouts": int(missing.sum()),
+            "overtime_hours": round(float(overtime.sum()) / SECONDS_PER_HOUR, 2),
+        },
+        "employees": employees,
+    }
+
+
+def parse_shift_start(value):
+    """Parses an ``HH:MM`` override of the shift start, returning None when invalid."""
+    try:
+        return datetime.strptime(value, '%H:%M').time()
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,204 @@
+import json
+import math
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password, verify_password
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotAuthenticated
+
+from .authentication import StatelessJWTAuthentication
+from .geofence import afind_office
+from .idempotency import idempotent
+from .models import Attendance, ExpectedPresence, User
+from .throttling import LoginRateThrottle
+from .views import bulk_admin_check, login_data, request_location
+
+
+class AsyncAPIView(View):
+    """
+    Minimal async counterpart of ``APIView`` for the check-in hot path: JWT
+    authentication, JSON or form body parsing and JSON responses, all
+    without leaving the event loop unless the ORM needs to.
+    """
+    authentication = StatelessJWTAuthentication()
+    authentication_required = True
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token-authenticated like the DRF views, so CSRF does not apply
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.authentication_required:
+            try:
+                result = await self.authentication.aauthenticate(request)
+                if result is None:
+                    raise NotAuthenticated()
+            except APIException as exc:
+                return self.exception_response(request, exc)
+            request.user, request.auth = result
+
+        try:
+            request.data = self.parse_body(request)
+        except ValueError:
+            return JsonResponse({"detail": "Malformed request body."}, status=400)
+        return await super().dispatch(request, *args, **kwargs)
+
+    def exception_response(self, request, exc):
+        """Renders ``exc`` the way DRF's ``exception_handler`` does."""
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = JsonResponse(data, status=exc.status_code, safe=False)
+        if exc.status_code == 401:
+            response['WWW-Authenticate'] = self.authentication.authenticate_header(request)
+        return response
+
+    def parse_body(self, request):
+        if request.content_type != 'application/json':
+            return request.POST
+        data = json.loads(request.body or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object.")
+        return data
+
+    async def get_role(self, user):
+        if 'role' in user.token:
+            return user.token['role']
+        # Tokens issued before the role claim was added
+        return (await User.objects.only('role').aget(pk=user.id)).role
+
+
+class AsyncCheckinView(AsyncAPIView):
+
+    @idempotent
+    async def post(self, request):
+        location = request_location(request)
+        if location is None:
+            return JsonResponse({"message": "Location is required."}, status=400)
+
+        office = await afind_office(*location)
+        if office is None:
+            return JsonResponse({"message": "You are too far from the office to check in."}, status=400)
+
+        now = timezone.now()
+        work_date = await ExpectedPresence.awork_date_for(request.user.id, now)
+        # A single INSERT needs no transaction; the unique constraint rejects duplicates
+        try:
+            await Attendance.objects.acreate(
+                employee_id=request.user.id, work_date=work_date, checkin_time=now, office_id=office.office_id
+            )
+        except IntegrityError:
+            return JsonResponse({"message": "Already checked in today!"}, status=400)
+        return JsonResponse({"message": "Check-in successful!"})
+
+
+class AsyncCheckoutView(AsyncAPIView):
+
+    @idempotent
+    async def post(self, request):
+        location = request_location(request)
+        if location is None:
+            return JsonResponse({"message": "Location is required."}, status=400)
+
+        if await afind_office(*location) is None:
+            return JsonResponse({"message": "You are too far from the office to check out."}, status=400)
+
+        now = timezone.now()
+        work_date = await ExpectedPresence.awork_date_for(request.user.id, now)
+        try:
+            attendance = await Attendance.objects.aget(employee_id=request.user.id, work_date=work_date)
+        except Attendance.DoesNotExist:
+            return JsonResponse({"message": "No check-in found!"}, status=400)
+        if attendance.checkout_time:
+            return JsonResponse({"message": "Already checked out!"}, status=400)
+        attendance.checkout_time = now
+        await attendance.asave()
+        return JsonResponse({"message": "Check-out successful!"})
+
+
+class AsyncAdminCheckInOutView(AsyncAPIView):
+
+    async def post(self, request):
+        if await self.get_role(request.user) != 'admin':
+            return JsonResponse({"message": "Permission denied."}, status=403)
+
+        if 'employee_ids' in request.data or 'group' in request.data:
+            payload, status_code = await sync_to_async(bulk_admin_check)(request.data)
+            return JsonResponse(payload, status=status_code)
+
+        employee_id = request.data.get('employee_id')
+        action = request.data.get('action')
+        if not employee_id or action not in ['check_in', 'check_out']:
+            return JsonResponse(
+                {"message": "Employee ID and valid action (checkin/checkout) are required."}, status=400
+            )
+
+        try:
+            employee = await User.objects.aget(id=employee_id)
+        except (User.DoesNotExist, ValueError):
+            return JsonResponse({"message": "Employee not found."}, status=404)
+
+        now = timezone.now()
+        work_date = await ExpectedPresence.awork_date_for(employee.id, now)
+        attendance = await Attendance.objects.filter(employee=employee, work_date=work_date).afirst()
+
+        if action == 'check_in':
+            if attendance and attendance.checkin_time:
+                return JsonResponse({"message": "The user is already checked in today!"}, status=400)
+            try:
+                await Attendance.objects.acreate(employee=employee, work_date=work_date, checkin_time=now)
+            except IntegrityError:
+                return JsonResponse({"message": "The user is already checked in today!"}, status=400)
+            return JsonResponse({"message": "Check-in successful!"})
+
+        if attendance and attendance.checkout_time:
+            return JsonResponse({"message": "The user is already checked out today!"}, status=400)
+        if not attendance:
+            return JsonResponse({"message": "No check-in record found for today!"}, status=400)
+        attendance.checkout_time = now
+        await attendance.asave()
+        return JsonResponse({"message": "Check-out successful!"})
+
+
+class AsyncLoginView(AsyncAPIView):
+    """
+    Login that keeps password hashing off the event loop: verification and
+    rehashing run in a thread pool, where the hashers release the GIL, so
+    one worker can check several passwords at once.
+    """
+    authentication_required = False
+
+    async def post(self, request):
+        throttle = LoginRateThrottle()
+        # The throttle reads and writes its history through the sync cache API
+        if not await sync_to_async(throttle.allow_request)(request, self):
+            wait = math.ceil(throttle.wait())
+            return JsonResponse(
+                {"detail": f"Request was throttled. Expected available in {wait} seconds."}, status=429,
+                headers={'Retry-After': str(wait)},
+            )
+
+        login = request.data.get('login')
+        password = request.data.get('password')
+        if not (isinstance(login, str) and isinstance(password, str)):
+            login = password = None
+        user = await User.objects.filter(username=login).afirst() if login else None
+
+        # Unknown users still pay for one hash, like ModelBackend does
+        encoded = user.password if user else UNUSABLE_PASSWORD_PREFIX
+        is_correct, must_update = await run_hasher(verify_password, password, encoded)
+        if not (is_correct and user.is_active):
+            return JsonResponse({'detail': 'Invalid credentials'}, status=401)
+
+        if must_update:
+            user.password = await run_hasher(make_password, password)
+            await User.objects.filter(pk=user.pk).aupdate(password=user.password)
+        return JsonResponse(login_data(user))
+
+
+def run_hasher(func, *args):
+    return sync_to_async(func, thread_sensitive=False)(*args)
@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User
+
+TOKEN_VERSION_CLAIM = 'token_version'
+TOKEN_VERSION_CACHE_KEY = 'auth:token-version:{}'
+# Cached in place of a version for deleted or deactivated users
+REVOKED = -1
+
+
+def issue_tokens(user):
+    """
+    Returns a refresh token carrying the claims that request handling needs,
+    so that authenticated requests do not have to load the user row.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh['role'] = user.role
+    refresh['is_superuser'] = user.is_superuser
+    refresh[TOKEN_VERSION_CLAIM] = user.token_version
+    return refresh
+
+
+def get_token_version(user_id):
+    key = TOKEN_VERSION_CACHE_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(pk=user_id, is_active=True).values_list('token_version', flat=True).first()
+        if version is None:
+            version = REVOKED
+        cache.set(key, version, timeout=settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+async def aget_token_version(user_id):
+    key = TOKEN_VERSION_CACHE_KEY.format(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = await User.objects.filter(pk=user_id, is_active=True).values_list('token_version', flat=True).afirst()
+        if version is None:
+            version = REVOKED
+        await cache.aset(key, version, timeout=settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def forget_token_version(user_id):
+    cache.delete(TOKEN_VERSION_CACHE_KEY.format(user_id))
+
+
+class AttendanceTokenUser(TokenUser):
+    """
+    Lightweight user built from the token claims. The database row is only
+    loaded when a view asks for :attr:`instance`, or for tokens issued before
+    the claims were added.
+    """
+
+    @cached_property
+    def instance(self):
+        return User.objects.get(pk=self.id)
+
+    @cached_property
+    def role(self):
+        return self.token['role'] if 'role' in self.token else self.instance.role
+
+    @cached_property
+    def is_superuser(self):
+        return self.token['is_superuser'] if 'is_superuser' in self.token else self.instance.is_superuser
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication that trusts the token claims instead of querying the
+    user on every request. Revocation is checked against the user's token
+    version, which is kept in the cache and only read from the database on a
+    cache miss.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        self.check_token_version(validated_token, get_token_version(user.id))
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of ``authenticate`` for plain async Django views.
+        Token parsing is pure CPU work; only the version lookup awaits.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        user = super().get_user(validated_token)
+        self.check_token_version(validated_token, await aget_token_version(user.id))
+        return user, validated_token
+
+    def check_token_version(self, validated_token, current_version):
+        if current_version == REVOKED:
+            raise AuthenticationFailed(_("User not found or inactive"), code="user_inactive")
+        if validated_token.get(TOKEN_VERSION_CLAIM, 0) != current_version:
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
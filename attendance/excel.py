@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models import DateTimeField, Func, Value
+from django.utils import timezone
+
+from .models import Attendance
+from .reports import COLUMN_WIDTH, ITERATOR_CHUNK_SIZE, REPORT_COLUMNS, daterange, shift_name
+
+HEADER_STYLE = 'Report Header'
+TIME_STYLE = 'Report Time'
+TIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+
+
+class LocalTime(Func):
+    """A timestamp on the wall clock of ``TIME_ZONE``, converted by PostgreSQL into a naive datetime."""
+    template = '(%(expressions)s)'
+    arg_joiner = ' AT TIME ZONE '
+    output_field = DateTimeField()
+
+    def __init__(self, expression):
+        super().__init__(expression, Value(settings.TIME_ZONE))
+
+
+def report_rows(start_date, end_date):
+    """
+    Yields ``(date, employee, shift, checkin, checkout)`` tuples for the
+    range, ordered by work date, with naive local datetimes that can be
+    written as date cells as they are. PostgreSQL converts the times in the
+    query; on other databases they are converted here.
+    """
+    records = Attendance.objects.filter(work_date__range=(start_date, end_date)).order_by('work_date', 'checkin_time')
+    in_sql = connections[records.db].vendor == 'postgresql'
+    times = (LocalTime('checkin_time'), LocalTime('checkout_time')) if in_sql else ('checkin_time', 'checkout_time')
+    rows = records.values_list(
+        'work_date', 'employee__first_name', 'employee__last_name', shift_name(), *times,
+    ).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+
+    local_tz = timezone.get_current_timezone()
+    for work_date, first_name, last_name, shift, checkin_time, checkout_time in rows:
+        if not in_sql:
+            checkin_time = checkin_time and checkin_time.astimezone(local_tz).replace(tzinfo=None)
+            checkout_time = checkout_time and checkout_time.astimezone(local_tz).replace(tzinfo=None)
+        yield work_date, f"{first_name} {last_name}".strip(), shift, checkin_time, checkout_time
+
+
+def write_report(start_date, end_date, output):
+    """
+    Writes one sheet per day into ``output`` with a write-only workbook.
+    Times are native date cells formatted by a named style, so Excel can
+    sort and compute with them.
+    """
+    # Imported here to keep openpyxl out of process startup
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, NamedStyle
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    workbook.add_named_style(NamedStyle(name=HEADER_STYLE, font=Font(bold=True)))
+    workbook.add_named_style(NamedStyle(name=TIME_STYLE, number_format=TIME_FORMAT))
+
+    rows = report_rows(start_date, end_date)
+    pending = next(rows, None)
+
+    for day in daterange(start_date, end_date):
+        worksheet = workbook.create_sheet(title=str(day))
+        for col_num in range(1, len(REPORT_COLUMNS) + 1):
+            worksheet.column_dimensions[get_column_letter(col_num)].width = COLUMN_WIDTH
+        header = [WriteOnlyCell(worksheet, title) for title in REPORT_COLUMNS]
+        for cell in header:
+            cell.style = HEADER_STYLE
+        worksheet.append(header)
+
+        # Appended cells are serialized right away, so every row can reuse the two styled ones
+        checkin_cell, checkout_cell = WriteOnlyCell(worksheet), WriteOnlyCell(worksheet)
+        checkin_cell.style = checkout_cell.style = TIME_STYLE
+
+        # Rows arrive ordered by work date, so each day's rows are contiguous
+        while pending is not None and pending[0] <= day:
+            work_date, employee, shift, checkin_time, checkout_time = pending
+            if work_date == day:
+                checkin_cell.value, checkout_cell.value = checkin_time, checkout_time
+                worksheet.append([
+                    employee, shift,
+                    checkin_cell if checkin_time else None,
+                    checkout_cell if checkout_time else None,
+                ])
+            pending = next(rows, None)
+
+    workbook.save(output)
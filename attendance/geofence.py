@@ -0,0 +1,177 @@
+import threading
+from collections import namedtuple
+from math import radians, cos, sin, asin, sqrt
+
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .versioning import aget_version, bump_version, get_version
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+VERSION_CACHE_KEY = 'geofence:version'
+
+BATCH_CHUNK_SIZE = 100_000
+
+OfficeMatch = namedtuple('OfficeMatch', ['office_id', 'distance'])
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+
+    # Haversine formula
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    c = 2 * asin(sqrt(a))
+    return c * EARTH_RADIUS_KM
+
+
+def haversine_np(lat1, lon1, lat2, lon2):
+    """
+    Vectorized haversine distance in kilometers. Arguments are degrees and
+    broadcast against each other like any NumPy ufunc.
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def validate_points(latitudes, longitudes, office_latitudes, office_longitudes, office_radii):
+    """
+    Checks many points against many offices in one call. Returns the
+    ``(points, offices)`` distance matrix in kilometers and a boolean matrix
+    of the same shape telling whether each point lies within each office.
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)[:, np.newaxis]
+    longitudes = np.asarray(longitudes, dtype=np.float64)[:, np.newaxis]
+    distances = haversine_np(latitudes, longitudes, np.asarray(office_latitudes, dtype=np.float64),
+                             np.asarray(office_longitudes, dtype=np.float64))
+    return distances, distances <= np.asarray(office_radii, dtype=np.float64)
+
+
+class OfficeIndex:
+    """
+    In-process index over every configured office. A bounding-box prefilter
+    picks candidate offices, then the exact distance is computed only for them.
+    """
+
+    def __init__(self, office_ids, latitudes, longitudes, radii):
+        self.office_ids = list(office_ids)
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.radii = np.asarray(radii, dtype=np.float64)
+
+        lat_margin = self.radii / KM_PER_DEGREE
+        # Longitude degrees shrink towards the poles; clamp so the box never collapses
+        lon_margin = lat_margin / np.maximum(np.cos(np.radians(self.latitudes)), 1e-6)
+        self.min_lat = self.latitudes - lat_margin
+        self.max_lat = self.latitudes + lat_margin
+        self.min_lon = self.longitudes - lon_margin
+        self.max_lon = self.longitudes + lon_margin
+
+    def __len__(self):
+        return len(self.office_ids)
+
+    @classmethod
+    def from_db(cls):
+        from .models import OfficeLocation
+
+        offices = list(OfficeLocation.objects.values_list('id', 'latitude', 'longitude', 'radius'))
+        if not offices:
+            # No offices configured yet: fall back to the single office from settings
+            return cls([None], [settings.OFFICE_LATITUDE], [settings.OFFICE_LONGITUDE], [settings.OFFICE_RADIUS])
+        office_ids, latitudes, longitudes, radii = zip(*offices)
+        return cls(office_ids, [float(v) for v in latitudes], [float(v) for v in longitudes], [float(v) for v in radii])
+
+    def match(self, latitude, longitude):
+        """
+        Returns the nearest office whose geofence contains the point, or
+        ``None`` when the point is outside all of them.
+        """
+        candidates = np.flatnonzero(
+            (self.min_lat <= latitude) & (latitude <= self.max_lat)
+            & (self.min_lon <= longitude) & (longitude <= self.max_lon)
+        )
+        if not candidates.size:
+            return None
+
+        distances = haversine_np(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        inside = distances <= self.radii[candidates]
+        if not inside.any():
+            return None
+        nearest = np.flatnonzero(inside)[np.argmin(distances[inside])]
+        return OfficeMatch(self.office_ids[candidates[nearest]], float(distances[nearest]))
+
+    def match_many(self, latitudes, longitudes, chunk_size=BATCH_CHUNK_SIZE):
+        """
+        Batch version of :meth:`match`. Returns a list with an
+        :class:`OfficeMatch` or ``None`` per point, processing the points in
+        chunks so the distance matrix stays bounded for large uploads.
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        matches = []
+        for start in range(0, len(latitudes), chunk_size):
+            distances, inside = validate_points(
+                latitudes[start:start + chunk_size], longitudes[start:start + chunk_size],
+                self.latitudes, self.longitudes, self.radii,
+            )
+            # Offices that do not contain the point never win the nearest-office pick
+            nearest = np.argmin(np.where(inside, distances, np.inf), axis=1)
+            rows = np.arange(len(nearest))
+            found = inside[rows, nearest]
+            nearest_distances = distances[rows, nearest]
+            matches.extend(
+                OfficeMatch(self.office_ids[office], float(distance)) if ok else None
+                for office, distance, ok in zip(nearest.tolist(), nearest_distances.tolist(), found.tolist())
+            )
+        return matches
+
+
+_lock = threading.Lock()
+_index = None
+_index_version = None
+
+
+def get_office_index():
+    """
+    Returns the cached office index, rebuilding it when another process (or
+    this one) has bumped the shared version after an office was changed.
+    """
+    global _index, _index_version
+
+    version = get_version(VERSION_CACHE_KEY)
+    if _index is None or _index_version != version:
+        with _lock:
+            if _index is None or _index_version != version:
+                _index, _index_version = OfficeIndex.from_db(), version
+    return _index
+
+
+async def aget_office_index():
+    global _index, _index_version
+
+    version = await aget_version(VERSION_CACHE_KEY)
+    if _index is None or _index_version != version:
+        index = await sync_to_async(OfficeIndex.from_db)()
+        with _lock:
+            _index, _index_version = index, version
+    return _index
+
+
+def invalidate_office_index():
+    return bump_version(VERSION_CACHE_KEY)
+
+
+def find_office(latitude, longitude):
+    return get_office_index().match(latitude, longitude)
+
+
+async def afind_office(latitude, longitude):
+    return (await aget_office_index()).match(latitude, longitude)
+
+
+def find_offices(latitudes, longitudes):
+    return get_office_index().match_many(latitudes, longitudes)
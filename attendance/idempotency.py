@@ -0,0 +1,103 @@
+import functools
+import hashlib
+import json
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_CACHE_KEY = 'idempotency:{}:{}:{}'
+MAX_KEY_LENGTH = 255
+# Stored while the first request with a key is still being handled
+IN_PROGRESS = 'in-progress'
+
+
+def idempotency_cache_key(request):
+    """
+    Returns the cache key for the request's ``Idempotency-Key``, scoped to
+    the user and path, None when the header is absent, or False when it is
+    malformed.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return None
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return False
+    digest = hashlib.md5(key.encode()).hexdigest()
+    return IDEMPOTENCY_CACHE_KEY.format(request.user.id, request.path, digest)
+
+
+def idempotent(method):
+    """
+    Makes a ``post`` handler safe to retry: the outcome of the first request
+    with a given ``Idempotency-Key`` is stored for ``IDEMPOTENCY_KEY_TTL``
+    seconds and replayed for repeats without running the handler again.
+    Works on DRF views and on the async views.
+    """
+    if iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(self, request, *args, **kwargs):
+            cache = caches[settings.IDEMPOTENCY_CACHE]
+            key = idempotency_cache_key(request)
+            if key is None:
+                return await method(self, request, *args, **kwargs)
+            if key is False:
+                return malformed_key(JsonResponse)
+            if not await cache.aadd(key, IN_PROGRESS, settings.IDEMPOTENCY_KEY_TTL):
+                return replay(JsonResponse, await cache.aget(key))
+            try:
+                response = await method(self, request, *args, **kwargs)
+            except BaseException:
+                await cache.adelete(key)
+                raise
+            await store(cache.aset, cache.adelete, key, response)
+            return response
+        return wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        cache = caches[settings.IDEMPOTENCY_CACHE]
+        key = idempotency_cache_key(request)
+        if key is None:
+            return method(self, request, *args, **kwargs)
+        if key is False:
+            return malformed_key(Response)
+        if not cache.add(key, IN_PROGRESS, settings.IDEMPOTENCY_KEY_TTL):
+            return replay(Response, cache.get(key))
+        try:
+            response = method(self, request, *args, **kwargs)
+        except BaseException:
+            cache.delete(key)
+            raise
+        store(cache.set, cache.delete, key, response)
+        return response
+    return wrapper
+
+
+def store(set_value, delete_value, key, response):
+    # Server errors are not replayed, the client should be able to try again
+    if response.status_code >= 500:
+        return delete_value(key)
+    data = response.data if isinstance(response, Response) else json.loads(response.content)
+    return set_value(key, (response.status_code, data), settings.IDEMPOTENCY_KEY_TTL)
+
+
+def replay(response_class, stored):
+    if stored is None or stored == IN_PROGRESS:
+        # Expired in the meantime or the first request has not finished yet
+        return response_class(
+            {"message": "A request with this Idempotency-Key is already being processed."}, status=409
+        )
+    status_code, data = stored
+    response = response_class(data, status=status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def malformed_key(response_class):
+    return response_class(
+        {"message": f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters long."}, status=400
+    )
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Attendance, ExpectedPresence, ReportJob, Shift
+from .reports import REPORT_FORMATS
+from .versioning import USERS_VERSION_KEY, get_version
+
+ARTIFACT_NAME = 'Attendance_Report_{}_to_{}_{}.{}'
+
+
+def report_data_version(start_date, end_date):
+    """
+    Fingerprint of everything a report of the range prints: its attendance
+    rows and calendar, computed by one aggregate query each, the shifts and
+    the users version stamp for the names. It changes whenever a row is
+    added, removed or updated, the calendar is regenerated, or an employee
+    or shift is renamed.
+    """
+    aggregate = Attendance.objects.filter(work_date__range=(start_date, end_date)).aggregate(
+        count=Count('id'), last_id=Max('id'), last_update=Max('updated_at'),
+    )
+    calendar = ExpectedPresence.objects.filter(work_date__range=(start_date, end_date)).aggregate(
+        count=Count('id'), last_id=Max('id'),
+    )
+    shifts = Shift.objects.aggregate(count=Count('id'), last_id=Max('id'), last_update=Max('updated_at'))
+    fingerprint = (
+        f"{aggregate['count']}:{aggregate['last_id']}:{aggregate['last_update']}:"
+        f"{calendar['count']}:{calendar['last_id']}:"
+        f"{shifts['count']}:{shifts['last_id']}:{shifts['last_update']}:{get_version(USERS_VERSION_KEY)}"
+    )
+    return hashlib.md5(fingerprint.encode()).hexdigest()
+
+
+def artifact_path(start_date, end_date, report_format, data_version):
+    return Path(settings.REPORT_STORAGE_DIR) / ARTIFACT_NAME.format(start_date, end_date, data_version, report_format)
+
+
+def prune_artifacts(job):
+    """
+    Deletes the files of earlier data versions of the job's report, which
+    :func:`find_artifact` can no longer serve. Returns the number deleted.
+    """
+    current = Path(job.file_path)
+    pruned = 0
+    for path in current.parent.glob(ARTIFACT_NAME.format(job.start_date, job.end_date, '*', job.format)):
+        if path != current:
+            path.unlink(missing_ok=True)
+            pruned += 1
+    return pruned
+
+
+def enqueue_report(start_date, end_date, report_format='xlsx', requested_by_id=None):
+    """
+    Returns a job for the range, reusing a queued, running or finished job
+    for the same data version instead of generating the report again.
+    """
+    data_version = report_data_version(start_date, end_date)
+    existing = ReportJob.objects.filter(
+        start_date=start_date, end_date=end_date, format=report_format, data_version=data_version,
+        status__in=['queued', 'running', 'done'],
+    ).order_by('-created_at').first()
+    if existing and (existing.status != 'done' or os.path.exists(existing.file_path)):
+        return existing
+    return ReportJob.objects.create(
+        requested_by_id=requested_by_id, start_date=start_date, end_date=end_date, format=report_format,
+        data_version=data_version,
+    )
+
+
+def find_artifact(start_date, end_date, report_format):
+    """Returns the path of an already generated report for the current data, if any."""
+    path = artifact_path(start_date, end_date, report_format, report_data_version(start_date, end_date))
+    return path if path.exists() else None
+
+
+def claim_next_job():
+    """Marks the oldest queued job as running; concurrent workers skip locked rows."""
+    with transaction.atomic():
+        job = (
+            ReportJob.objects.select_for_update(skip_locked=True)
+            .filter(status='queued').order_by('created_at').first()
+        )
+        if job is None:
+            return None
+        job.status = 'running'
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+    return job
+
+
+def requeue_stale_jobs():
+    """Puts back jobs left running by a worker that died, returning their count."""
+    return ReportJob.objects.filter(
+        status='running', started_at__lt=timezone.now() - settings.REPORT_JOB_TIMEOUT,
+    ).update(status='queued', started_at=None)
+
+
+def run_job(job):
+    # The data may have changed since the job was queued; label the file with what it contains
+    job.data_version = report_data_version(job.start_date, job.end_date)
+    path = artifact_path(job.start_date, job.end_date, job.format, job.data_version)
+    try:
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write next to the target and rename, so readers never see a partial file
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.part', delete=False) as output:
+                try:
+                    REPORT_FORMATS[job.format].writer(job.start_date, job.end_date, output)
+                except Exception:
+                    os.unlink(output.name)
+                    raise
+            os.replace(output.name, path)
+    except Exception as exc:
+        job.status = 'failed'
+        job.error = str(exc)
+    else:
+        job.status = 'done'
+        job.file_path = str(path)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['data_version', 'status', 'file_path', 'error', 'finished_at'])
+    return job
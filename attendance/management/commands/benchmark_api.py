@@ -0,0 +1,206 @@
+import json
+import platform
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import django
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from attendance.authentication import issue_tokens
+from attendance.models import Attendance, OfficeLocation, User
+
+BATCH_SIZE = 5000
+REPORT_RANGES = {'report_1_day': 1, 'report_1_month': 30, 'report_1_year': 365}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database with employees and attendance history, then measures "
+        "latency percentiles, query counts and peak memory of the main API endpoints."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=200)
+        parser.add_argument('--days', type=int, default=30, help="Days of attendance history to seed.")
+        parser.add_argument('--requests', type=int, default=50, help="Requests per endpoint.")
+        parser.add_argument('--report-requests', type=int, default=4, help="Requests per report range.")
+        parser.add_argument('--concurrency', type=int, default=0,
+                            help="Clients for the morning check-in storm; 0 skips it.")
+        parser.add_argument('--output', default='benchmark_results.json')
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            employees = self.seed(options['employees'], options['days'])
+            results = self.run_benchmarks(employees, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        payload = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'async_views': settings.ATTENDANCE_ASYNC_VIEWS,
+                'employees': options['employees'],
+                'days': options['days'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as output:
+            json.dump(payload, output, indent=2, sort_keys=True)
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<22} p50={result['p50_ms']:>9.2f}ms p95={result['p95_ms']:>9.2f}ms "
+                f"queries={result['queries']:>4} peak={result['peak_memory_kb']:>9.1f}KiB"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def seed(self, employee_count, days):
+        password = make_password('benchmark')
+        User.objects.create(username='bench-admin', password=password, role='admin')
+        User.objects.bulk_create(
+            [User(username=f'bench-{number}', password=password, first_name=f'Employee {number}', last_name='Bench')
+             for number in range(employee_count)],
+            batch_size=BATCH_SIZE,
+        )
+        OfficeLocation.objects.create(latitude=settings.OFFICE_LATITUDE, longitude=settings.OFFICE_LONGITUDE, radius=1)
+
+        employees = list(User.objects.filter(role='employee').order_by('id'))
+        today = timezone.localdate()
+        records = []
+        for offset in range(1, days + 1):
+            day = today - timedelta(days=offset)
+            start = timezone.make_aware(datetime.combine(day, settings.ATTENDANCE_SHIFT_START))
+            for number, employee in enumerate(employees):
+                checkin_time = start + timedelta(minutes=(number * 7) % 40 - 20)
+                records.append(Attendance(
+                    employee=employee, work_date=day, checkin_time=checkin_time,
+                    checkout_time=checkin_time + timedelta(hours=8, minutes=number % 60),
+                ))
+            if len(records) >= BATCH_SIZE:
+                Attendance.objects.bulk_create(records, batch_size=BATCH_SIZE)
+                records = []
+        Attendance.objects.bulk_create(records, batch_size=BATCH_SIZE)
+        return employees
+
+    def run_benchmarks(self, employees, options):
+        admin = User.objects.get(username='bench-admin')
+        admin_headers = self.auth_headers(admin)
+        location = {'latitude': settings.OFFICE_LATITUDE, 'longitude': settings.OFFICE_LONGITUDE}
+        today = timezone.localdate()
+        sample = employees[:options['requests']]
+        client = Client()
+
+        results = {
+            'checkin': self.measure([
+                lambda employee=employee: client.post('/api/checkin/', location, **self.auth_headers(employee))
+                for employee in sample
+            ]),
+            'checkout': self.measure([
+                lambda employee=employee: client.post('/api/checkout/', location, **self.auth_headers(employee))
+                for employee in sample
+            ]),
+            'user_list': self.measure(
+                [lambda: client.get('/api/users/', **admin_headers)] * options['requests'], clear_cache=True,
+            ),
+            'user_list_cached': self.measure([lambda: client.get('/api/users/', **admin_headers)] * options['requests']),
+        }
+        for name, days in REPORT_RANGES.items():
+            params = {'start_date': str(today - timedelta(days=days - 1)), 'end_date': str(today)}
+            results[name] = self.measure(
+                [lambda params=params: client.get('/api/admin/report/', params, **admin_headers)]
+                * options['report_requests']
+            )
+
+        if options['concurrency']:
+            results['checkin_storm'] = self.storm(employees[options['requests']:], location, options['concurrency'])
+        return results
+
+    def auth_headers(self, user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {issue_tokens(user).access_token}'}
+
+    def call(self, request):
+        response = request()
+        # Streaming responses only do their work while being consumed
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def measure(self, requests, clear_cache=False):
+        # The first request doubles as warm-up and is traced for peak memory;
+        # tracing skews timings, so it is left out of the latency figures
+        if clear_cache:
+            cache.clear()
+        tracemalloc.start()
+        response = self.call(requests[0])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies, query_counts, errors = [], [], int(response.status_code >= 400)
+        for request in requests[1:]:
+            if clear_cache:
+                cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = self.call(request)
+                latencies.append(time.perf_counter() - start)
+            query_counts.append(len(queries.captured_queries))
+            errors += response.status_code >= 400
+
+        result = self.summarize(latencies)
+        result.update(queries=max(query_counts, default=0), errors=errors, peak_memory_kb=peak / 1024)
+        return result
+
+    def storm(self, employees, location, concurrency):
+        """Checks every remaining employee in at once from ``concurrency`` clients."""
+        headers = [self.auth_headers(employee) for employee in employees]
+
+        def check_in(employee_headers):
+            try:
+                start = time.perf_counter()
+                response = Client(raise_request_exception=False).post('/api/checkin/', location, **employee_headers)
+                return time.perf_counter() - start, response.status_code
+            finally:
+                connections.close_all()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(check_in, headers))
+        elapsed = time.perf_counter() - start
+
+        result = self.summarize([latency for latency, _ in outcomes])
+        result.update(
+            queries=0, peak_memory_kb=0.0,
+            errors=sum(status_code >= 400 for _, status_code in outcomes),
+            throughput_rps=len(outcomes) / elapsed if elapsed else 0.0,
+        )
+        return result
+
+    def summarize(self, latencies):
+        if not latencies:
+            return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        milliseconds = np.asarray(latencies) * 1000
+        p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+        return {
+            'count': len(latencies),
+            'mean_ms': float(milliseconds.mean()),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(milliseconds.max()),
+        }
@@ -0,0 +1,139 @@
+import multiprocessing
+import resource
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from attendance.excel import write_report
+from attendance.models import Attendance, User
+
+BATCH_SIZE = 5000
+
+
+def write_pandas_report(start_date, end_date, output):
+    """
+    The report writer the API used before the compact one: a DataFrame per
+    day written with ``to_excel``, widths set per sheet and times formatted
+    in Python. Kept as the baseline, with its per-row employee query folded
+    into ``select_related`` so only the writing is compared.
+    """
+    import pandas as pd
+    from openpyxl.utils import get_column_letter
+
+    records_by_date = {}
+    for single_date in pd.date_range(start=start_date, end=end_date):
+        records = Attendance.objects.filter(work_date=single_date.date()).select_related('employee')
+        records_by_date[single_date.date()] = [
+            {
+                'Employee': f"{record.employee.first_name} {record.employee.last_name}".strip(),
+                'Check-in Time': record.checkin_time.astimezone(timezone.get_current_timezone()).strftime(
+                    '%Y-%m-%d %H:%M:%S'),
+                'Check-out Time': record.checkout_time.astimezone(timezone.get_current_timezone()).strftime(
+                    '%Y-%m-%d %H:%M:%S') if record.checkout_time else None,
+            }
+            for record in records
+        ]
+
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for day, data in records_by_date.items():
+            df = pd.DataFrame(data)
+            df.to_excel(writer, sheet_name=str(day), index=False)
+            worksheet = writer.sheets[str(day)]
+            for col_num in range(1, len(df.columns) + 1):
+                worksheet.column_dimensions[get_column_letter(col_num)].width = 40
+
+
+WRITERS = {'pandas': write_pandas_report, 'compact': write_report}
+
+
+def run_writer(name, start_date, end_date, results):
+    """Runs in a forked child, so its peak RSS covers this writer only."""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryFile() as output:
+        start = time.perf_counter()
+        WRITERS[name](start_date, end_date, output)
+        elapsed = time.perf_counter() - start
+        size = output.tell()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.send((elapsed, size, peak, peak - baseline))
+    results.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database with attendance history, then times each Excel report writer "
+        "in a fresh forked process and reports rows per second and peak RSS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=200)
+        parser.add_argument('--days', type=int, default=30, help="Days of history, one sheet each.")
+        parser.add_argument('--runs', type=int, default=3, help="Runs per writer; the fastest is reported.")
+        parser.add_argument('--writers', default=','.join(WRITERS), help="Comma-separated writers to compare.")
+
+    def handle(self, *args, **options):
+        writers = options['writers'].split(',')
+        unknown = set(writers) - set(WRITERS)
+        if unknown:
+            raise CommandError(f"Unknown writers: {', '.join(sorted(unknown))}.")
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            start_date, end_date = self.seed(options['employees'], options['days'])
+            rows = Attendance.objects.count()
+            self.stdout.write(f"{rows} rows over {options['days']} days on {connection.vendor}")
+            self.stdout.write(
+                f"{'writer':<10} {'seconds':>9} {'rows/s':>10} {'size (KiB)':>11} "
+                f"{'peak RSS (MiB)':>15} {'RSS growth (MiB)':>17}"
+            )
+            for name in writers:
+                runs = [self.measure(name, start_date, end_date) for _ in range(options['runs'])]
+                elapsed, size, peak, growth = min(runs)
+                self.stdout.write(
+                    f"{name:<10} {elapsed:>9.3f} {rows / elapsed:>10.0f} {size / 1024:>11.1f} "
+                    f"{peak / 1024:>15.1f} {max(growth for *_, growth in runs) / 1024:>17.1f}"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, employee_count, days):
+        User.objects.bulk_create(
+            [User(username=f'bench-{number}', first_name=f'Employee {number}', last_name='Bench')
+             for number in range(employee_count)],
+            batch_size=BATCH_SIZE,
+        )
+        employees = list(User.objects.order_by('id'))
+        today = timezone.localdate()
+        records = []
+        for offset in range(1, days + 1):
+            day = today - timedelta(days=offset)
+            start = timezone.make_aware(datetime.combine(day, settings.ATTENDANCE_SHIFT_START))
+            for number, employee in enumerate(employees):
+                checkin_time = start + timedelta(minutes=(number * 7) % 40 - 20)
+                records.append(Attendance(
+                    employee=employee, work_date=day, checkin_time=checkin_time,
+                    checkout_time=checkin_time + timedelta(hours=8, minutes=number % 60) if number % 10 else None,
+                ))
+            if len(records) >= BATCH_SIZE:
+                Attendance.objects.bulk_create(records, batch_size=BATCH_SIZE)
+                records = []
+        Attendance.objects.bulk_create(records, batch_size=BATCH_SIZE)
+        return today - timedelta(days=days), today - timedelta(days=1)
+
+    def measure(self, name, start_date, end_date):
+        # A forked child inherits the test database; server connections are reopened there
+        connections.close_all()
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.get_context('fork').Process(
+            target=run_writer, args=(name, start_date, end_date, sender),
+        )
+        process.start()
+        sender.close()
+        result = receiver.recv()
+        process.join()
+        return result
@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from attendance.geofence import haversine, validate_points
+
+DEFAULT_SIZES = [1, 100, 10_000, 1_000_000]
+
+
+class Command(BaseCommand):
+    help = "Compares the scalar haversine with the vectorized batch validation."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+        parser.add_argument('--offices', type=int, default=1)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        office_lat = rng.uniform(41.2, 41.4, options['offices'])
+        office_lon = rng.uniform(69.1, 69.3, options['offices'])
+        office_radius = np.full(options['offices'], 0.5)
+
+        self.stdout.write(f"{'points':>10} {'scalar (s)':>12} {'vector (s)':>12} {'speedup':>9}")
+        for size in options['sizes']:
+            lat = rng.uniform(41.2, 41.4, size)
+            lon = rng.uniform(69.1, 69.3, size)
+            lat_list, lon_list = lat.tolist(), lon.tolist()
+            offices = list(zip(office_lat.tolist(), office_lon.tolist(), office_radius.tolist()))
+
+            def scalar():
+                return [
+                    [haversine(p_lat, p_lon, o_lat, o_lon) <= o_radius for o_lat, o_lon, o_radius in offices]
+                    for p_lat, p_lon in zip(lat_list, lon_list)
+                ]
+
+            def vector():
+                return validate_points(lat, lon, office_lat, office_lon, office_radius)
+
+            scalar_time = self.best_of(scalar, options['repeat'])
+            vector_time = self.best_of(vector, options['repeat'])
+            self.stdout.write(
+                f"{size:>10} {scalar_time:>12.6f} {vector_time:>12.6f} {scalar_time / vector_time:>8.1f}x"
+            )
+
+    def best_of(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
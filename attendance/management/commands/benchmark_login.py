@@ -0,0 +1,78 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher, make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from attendance.hashers import TunedArgon2PasswordHasher, TunedBCryptSHA256PasswordHasher
+from attendance.models import User
+
+HASHERS = {
+    'argon2': TunedArgon2PasswordHasher,
+    'bcrypt': TunedBCryptSHA256PasswordHasher,
+    'pbkdf2': PBKDF2PasswordHasher,
+}
+PASSWORD = 'benchmark-password'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures password verifications per second for each hasher, on one thread and on a "
+        "thread pool, then logins per second through /api/login/ with the configured hasher."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hashers', nargs='+', choices=list(HASHERS), default=list(HASHERS))
+        parser.add_argument('--logins', type=int, default=50, help="Verifications or logins per measurement.")
+        parser.add_argument('--threads', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--skip-endpoint', action='store_true', help="Only measure the hashers.")
+
+    def handle(self, *args, **options):
+        logins, threads = options['logins'], options['threads']
+        self.stdout.write(f"{'hasher':<8} {'per core/s':>11} {f'{threads} threads/s':>13} {'hash (ms)':>10}")
+        for name in options['hashers']:
+            hasher = HASHERS[name]()
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+
+            start = time.perf_counter()
+            for _ in range(logins):
+                hasher.verify(PASSWORD, encoded)
+            single = logins / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(lambda _: hasher.verify(PASSWORD, encoded), range(logins)))
+            parallel = logins / (time.perf_counter() - start)
+            self.stdout.write(f"{name:<8} {single:>11.1f} {parallel:>13.1f} {1000 / single:>10.1f}")
+
+        if not options['skip_endpoint']:
+            self.benchmark_endpoint(logins)
+
+    def benchmark_endpoint(self, logins):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            password = make_password(PASSWORD)
+            User.objects.bulk_create(
+                [User(username=f'bench-login-{number}', password=password) for number in range(logins)]
+            )
+            cache.clear()
+            client = Client()
+            start = time.perf_counter()
+            failures = sum(
+                client.post('/api/login/', {'login': f'bench-login-{number}', 'password': PASSWORD}).status_code
+                != 200
+                for number in range(logins)
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(
+            f"/api/login/ with {get_hasher().algorithm} ({settings.PASSWORD_HASHER}): "
+            f"{logins / elapsed:.1f} logins/s on one thread, {failures} failures"
+        )
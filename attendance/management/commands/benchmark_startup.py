@@ -0,0 +1,53 @@
+import re
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+# Run in a fresh interpreter: what a new worker does before serving its first request
+STARTUP_SCRIPT = (
+    "import time; start = time.perf_counter(); "
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns; "
+    "print(time.perf_counter() - start)"
+)
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures how long a new process takes to set up Django and load every view, with the "
+        "slowest top-level imports. Child processes inherit DJANGO_SETTINGS_MODULE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--top', type=int, default=15, help="Slowest imports to list.")
+
+    def handle(self, *args, **options):
+        timings = [
+            float(subprocess.run(
+                [sys.executable, '-c', STARTUP_SCRIPT], check=True, capture_output=True, text=True,
+            ).stdout)
+            for _ in range(options['runs'])
+        ]
+        self.stdout.write(
+            f"Startup over {len(timings)} runs: median {statistics.median(timings) * 1000:.0f} ms, "
+            f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms"
+        )
+
+        trace = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            check=True, capture_output=True, text=True,
+        ).stderr
+        # Top-level packages only, with the time of everything they import
+        packages = {}
+        for match in IMPORT_TIME.finditer(trace):
+            cumulative, indent, module = int(match[2]), len(match[3]), match[4]
+            if indent == 1:
+                package = module.split('.')[0]
+                packages[package] = packages.get(package, 0) + cumulative
+        self.stdout.write(f"{'package':<30} {'import (ms)':>12}")
+        for package, micros in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"{package:<30} {micros / 1000:>12.1f}")
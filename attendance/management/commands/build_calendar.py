@@ -0,0 +1,33 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from attendance.schedules import build_calendar, extend_calendar
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the expected-presence calendar from the schedules. Without --start, extends it to "
+        "ATTENDANCE_CALENDAR_DAYS ahead; run it daily, e.g. from cron. With --start, regenerates the "
+        "range, e.g. to backfill the past after adding schedules."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help="First day (YYYY-MM-DD) to regenerate.")
+        parser.add_argument('--end', type=date.fromisoformat,
+                            help="Last day (YYYY-MM-DD), defaults to ATTENDANCE_CALENDAR_DAYS from today.")
+
+    def handle(self, *args, **options):
+        if options['start'] is None:
+            count = extend_calendar()
+            self.stdout.write(self.style.SUCCESS(f"Added {count} shift instances to the calendar."))
+            return
+
+        start_date = options['start']
+        end_date = options['end'] or timezone.localdate() + timedelta(days=settings.ATTENDANCE_CALENDAR_DAYS)
+        if start_date > end_date:
+            raise CommandError("--start must not be after --end.")
+        count = build_calendar(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(f"Generated {count} shift instances from {start_date} to {end_date}."))
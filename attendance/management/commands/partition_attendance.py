@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from attendance import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintains the monthly partitions of the attendance table on PostgreSQL: creates the upcoming "
+        "months, folds closed years into yearly archive partitions and drops archives past "
+        "ATTENDANCE_RETENTION_YEARS. With --convert, first turns the plain table into a partitioned one. "
+        "Run it daily, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true',
+                            help="Convert the plain attendance table; takes an exclusive lock while copying.")
+
+    def handle(self, *args, **options):
+        if not partitioning.is_supported():
+            self.stdout.write("Partitioning needs PostgreSQL; the attendance table stays a plain table.")
+            return
+
+        if options['convert']:
+            created = partitioning.convert_table(settings.ATTENDANCE_PARTITION_MONTHS_AHEAD)
+            self.stdout.write(f"Converted the attendance table, {len(created)} monthly partitions created.")
+
+        result = partitioning.maintain_partitions()
+        if result is None:
+            self.stdout.write(
+                "The attendance table is not partitioned; nothing to maintain. Run with --convert to partition it."
+            )
+            return
+        created, archived, dropped = result
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+        for year in archived:
+            self.stdout.write(f"Archived {year} into one partition")
+        for year in dropped:
+            self.stdout.write(f"Dropped the attendance rows of {year}; its daily summaries are kept")
+        self.stdout.write(self.style.SUCCESS("Attendance partitions are up to date."))
@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from attendance.models import RetentionCutoff
+from attendance.summaries import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuilds DailyAttendanceSummary rows for a date range from the attendance records."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, required=True, help="First day (YYYY-MM-DD).")
+        parser.add_argument('--end', type=date.fromisoformat, help="Last day (YYYY-MM-DD), defaults to today.")
+
+    def handle(self, *args, **options):
+        start_date = options['start']
+        end_date = options['end'] or timezone.localdate()
+        if start_date > end_date:
+            raise CommandError("--start must not be after --end.")
+
+        cutoff = RetentionCutoff.latest()
+        if cutoff is not None and start_date < cutoff:
+            if end_date < cutoff:
+                raise CommandError(f"Attendance before {cutoff} was dropped by the retention policy.")
+            self.stderr.write(self.style.WARNING(
+                f"Attendance before {cutoff} was dropped by the retention policy; starting at {cutoff}."
+            ))
+            start_date = cutoff
+
+        count = rebuild_summaries(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} summaries from {start_date} to {end_date}."))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from attendance.jobs import claim_next_job, prune_artifacts, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates queued report jobs and deletes the files of superseded data versions. "
+        "Several workers can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help="Seconds to wait between polls while the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty.")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s).")
+
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            job = run_job(job)
+            if job.status == 'done':
+                self.stdout.write(self.style.SUCCESS(f"Job {job.pk} done: {job.file_path}"))
+                pruned = prune_artifacts(job)
+                if pruned:
+                    self.stdout.write(f"Deleted {pruned} superseded report file(s).")
+            else:
+                self.stderr.write(f"Job {job.pk} failed: {job.error}")
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from attendance.scheduler import next_run, run_checks
+
+
+class Command(BaseCommand):
+    help = (
+        "Detects absentees and missing check-outs at the ATTENDANCE_SCHEDULE_TIMES local times, "
+        "auto-closes stale sessions and writes the findings to the notifications outbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Run the checks now and exit.")
+
+    def handle(self, *args, **options):
+        while True:
+            if not options['once']:
+                run_at = next_run(timezone.now(), settings.ATTENDANCE_SCHEDULE_TIMES)
+                self.stdout.write(f"Next run at {run_at.isoformat()}")
+                time.sleep(max((run_at - timezone.now()).total_seconds(), 0))
+
+            close_old_connections()
+            counts = run_checks()
+            self.stdout.write(self.style.SUCCESS(
+                f"{counts['absent']} absent, {counts['missing_checkout']} missing check-outs, "
+                f"{counts['auto_closed']} sessions auto-closed."
+            ))
+            if options['once']:
+                return
@@ -0,0 +1,97 @@
+import os
+import re
+import time
+from contextvars import ContextVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, generate_latest, multiprocess
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+MEMORY_BUCKETS = (0, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+LABELS = ('method', 'view')
+
+PAGE_SIZE = resource.getpagesize() if resource else 4096
+
+_query_log = ContextVar('query_log', default=None)
+
+# With PROMETHEUS_MULTIPROC_DIR set before startup, every worker writes its
+# samples to files there and a scrape of any worker reads them all
+REGISTRY = CollectorRegistry()
+
+REQUEST_DURATION = Histogram(
+    'attendance_request_duration_seconds', "Wall time spent handling a request.", LABELS,
+    buckets=LATENCY_BUCKETS, registry=REGISTRY)
+DB_QUERIES = Histogram(
+    'attendance_db_queries', "Database queries executed per request.", LABELS,
+    buckets=QUERY_COUNT_BUCKETS, registry=REGISTRY)
+DB_DURATION = Histogram(
+    'attendance_db_duration_seconds', "Time spent in database queries per request.", LABELS,
+    buckets=LATENCY_BUCKETS, registry=REGISTRY)
+RESPONSE_SIZE = Histogram(
+    'attendance_response_size_bytes', "Size of non-streaming response bodies.", LABELS,
+    buckets=SIZE_BUCKETS, registry=REGISTRY)
+MEMORY_DELTA = Histogram(
+    'attendance_memory_delta_bytes', "Resident memory growth of the process while handling a request.", LABELS,
+    buckets=MEMORY_BUCKETS, registry=REGISTRY)
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+def render_metrics():
+    """Renders the histograms in the Prometheus text format, merged across worker processes in multiprocess mode."""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def current_rss():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        # Peak RSS is the closest portable figure (kilobytes on Linux/BSD)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 if resource else 0
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing every query run while a query log is
+    active. It is installed on each connection once and is a no-op otherwise.
+    """
+    log = _query_log.get()
+    if log is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        log.append((sql, time.perf_counter() - start))
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def start_query_log():
+    log = []
+    return log, _query_log.set(log)
+
+
+def stop_query_log(token):
+    _query_log.reset(token)
+
+
+def fingerprint(sql):
+    """Reduces a query to its shape by replacing literals and IN lists."""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    sql = re.sub(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)', '(...)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
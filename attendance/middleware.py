@@ -0,0 +1,134 @@
+import logging
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.module_loading import import_string
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentationMiddleware:
+    """
+    Records wall time, query count and time, response size and memory growth
+    for every request, labelled by view, and logs the query fingerprints of
+    requests slower than ``SLOW_REQUEST_THRESHOLD_MS``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+        connection_created.connect(metrics.install_query_recorder, dispatch_uid='attendance-query-recorder')
+        for connection in connections.all(initialized_only=True):
+            metrics.install_query_recorder(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.stop_query_log(state[1])
+        self.finish(request, response, state)
+        return response
+
+    async def __acall__(self, request):
+        state = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.stop_query_log(state[1])
+        self.finish(request, response, state)
+        return response
+
+    def start(self):
+        log, token = metrics.start_query_log()
+        return log, token, time.perf_counter(), metrics.current_rss()
+
+    def finish(self, request, response, state):
+        log, _, start, rss = state
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        labels = (request.method, view)
+        query_time = sum(elapsed for _, elapsed in log)
+
+        metrics.REQUEST_DURATION.labels(*labels).observe(duration)
+        metrics.DB_QUERIES.labels(*labels).observe(len(log))
+        metrics.DB_DURATION.labels(*labels).observe(query_time)
+        metrics.MEMORY_DELTA.labels(*labels).observe(max(metrics.current_rss() - rss, 0))
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+
+        if duration * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            shapes = Counter(metrics.fingerprint(sql) for sql, _ in log)
+            logger.warning(
+                "Slow request %s %s (%s): %.1f ms, %d queries in %.1f ms\n%s",
+                request.method, request.path, view, duration * 1000, len(log), query_time * 1000,
+                '\n'.join(f"  {count}x {shape}" for shape, count in shapes.most_common()),
+            )
+
+
+class BrowserOnlyMiddleware:
+    """
+    Runs the middleware listed in ``BROWSER_MIDDLEWARE`` (sessions, CSRF,
+    messages...) for every path except those under ``API_PATH_PREFIX``.
+    JWT-authenticated API requests skip them entirely, including their
+    ``process_view`` hooks, which this middleware delegates.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.inner = get_response
+        self.middleware = []
+        for path in reversed(settings.BROWSER_MIDDLEWARE):
+            self.inner = import_string(path)(self.inner)
+            self.middleware.insert(0, self.inner)
+        self.view_hooks = [mw.process_view for mw in self.middleware if hasattr(mw, 'process_view')]
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # A coroutine hook keeps API requests on the event loop
+            self.process_view = self.aprocess_view
+
+    def is_api(self, request):
+        return request.path_info.startswith(settings.API_PATH_PREFIX)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request) if self.is_api(request) else self.inner(request)
+
+    async def __acall__(self, request):
+        if self.is_api(request):
+            return await self.get_response(request)
+        return await self.inner(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_api(request):
+            return None
+        for hook in self.view_hooks:
+            response = hook(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_api(request):
+            return None
+        for hook in self.view_hooks:
+            response = await sync_to_async(hook, thread_sensitive=True)(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,69 @@
+# Generated by Django 5.1 on 2026-10-17 22:36
+
+from django.db import migrations, models
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_work_date(apps, schema_editor):
+    """
+    Fills ``work_date`` from the local check-in date and folds any duplicate
+    rows for the same employee and day into one, so the unique constraint
+    can be added. Rows with neither a check-in nor a check-out carry no data
+    and are removed.
+    """
+    Attendance = apps.get_model('attendance', 'Attendance')
+    Attendance.objects.filter(checkin_time__isnull=True, checkout_time__isnull=True).delete()
+
+    pending, duplicates = [], []
+    kept, current_employee = {}, None
+    records = Attendance.objects.order_by('employee_id', 'checkin_time', 'id')
+    for record in records.iterator(chunk_size=BATCH_SIZE):
+        if record.employee_id != current_employee:
+            # Merges only happen within one employee, so their rows are final here
+            if len(pending) >= BATCH_SIZE:
+                Attendance.objects.bulk_update(pending, ['work_date', 'checkin_time', 'checkout_time'], batch_size=BATCH_SIZE)
+                pending = []
+            kept, current_employee = {}, record.employee_id
+
+        record.work_date = timezone.localdate(record.checkin_time or record.checkout_time)
+        first = kept.get(record.work_date)
+        if first is None:
+            kept[record.work_date] = record
+            pending.append(record)
+        else:
+            if record.checkin_time and (first.checkin_time is None or record.checkin_time < first.checkin_time):
+                first.checkin_time = record.checkin_time
+            if record.checkout_time and (first.checkout_time is None or record.checkout_time > first.checkout_time):
+                first.checkout_time = record.checkout_time
+            duplicates.append(record.pk)
+
+    Attendance.objects.bulk_update(pending, ['work_date', 'checkin_time', 'checkout_time'], batch_size=BATCH_SIZE)
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        Attendance.objects.filter(pk__in=duplicates[start:start + BATCH_SIZE]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_officelocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='work_date',
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(backfill_work_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='attendance',
+            name='work_date',
+            field=models.DateField(),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('employee', 'work_date'), name='unique_attendance_per_day'),
+        ),
+    ]
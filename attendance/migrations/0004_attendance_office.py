@@ -0,0 +1,24 @@
+# Generated by Django 5.1 on 2026-10-17 22:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_attendance_work_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='office',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='attendance.officelocation'),
+        ),
+        migrations.AlterField(
+            model_name='officelocation',
+            name='radius',
+            field=models.DecimalField(decimal_places=2, help_text='Geofence radius in kilometers.', max_digits=6),
+        ),
+    ]
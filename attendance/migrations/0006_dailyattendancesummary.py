@@ -0,0 +1,32 @@
+# Generated by Django 5.1 on 2026-10-17 22:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('first_in', models.DateTimeField(blank=True, null=True)),
+                ('last_out', models.DateTimeField(blank=True, null=True)),
+                ('worked_seconds', models.PositiveIntegerField(default=0)),
+                ('is_late', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('present', 'Present'), ('incomplete', 'Incomplete'), ('absent', 'Absent')], default='absent', max_length=10)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'status'], name='attendance__date_3ed358_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'date'), name='unique_summary_per_day')],
+            },
+        ),
+    ]
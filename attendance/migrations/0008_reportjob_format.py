@@ -0,0 +1,26 @@
+# Generated by Django 5.1 on 2026-10-17 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0007_reportjob'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reportjob',
+            name='attendance__start_d_3b1cef_idx',
+        ),
+        migrations.AddField(
+            model_name='reportjob',
+            name='format',
+            field=models.CharField(choices=[('xlsx', 'Excel'), ('csv', 'CSV'), ('parquet', 'Parquet')], default='xlsx', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='reportjob',
+            index=models.Index(fields=['start_date', 'end_date', 'format', 'data_version'], name='attendance__start_d_b87d9d_idx'),
+        ),
+    ]
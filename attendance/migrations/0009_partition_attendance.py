@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def partition_attendance(apps, schema_editor):
+    """
+    Converts the attendance table when ATTENDANCE_PARTITIONING is set on
+    PostgreSQL. Existing deployments can run ``manage.py partition_attendance
+    --convert`` at a quiet time instead.
+    """
+    if schema_editor.connection.vendor != 'postgresql' or not settings.ATTENDANCE_PARTITIONING:
+        return
+    from attendance.partitioning import convert_table
+
+    convert_table(settings.ATTENDANCE_PARTITION_MONTHS_AHEAD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0008_reportjob_format'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_attendance, migrations.RunPython.noop),
+    ]
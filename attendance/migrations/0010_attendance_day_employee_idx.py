@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-17 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0009_partition_attendance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['work_date', 'employee'], name='attendance_day_employee_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-17 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0010_attendance_day_employee_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['employee', 'checkin_time'], name='attendance_emp_checkin_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1 on 2026-10-17 23:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0011_attendance_emp_checkin_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='auto_closed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('absent', 'Absent'), ('missing_checkout', 'Missing check-out'), ('auto_closed', 'Session auto-closed')], max_length=20)),
+                ('date', models.DateField()),
+                ('message', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['employee', 'id'], name='attendance__employe_3cc804_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'date', 'kind'), name='unique_notification_per_day')],
+            },
+        ),
+    ]
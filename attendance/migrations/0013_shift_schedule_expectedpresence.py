@@ -0,0 +1,53 @@
+# Generated by Django 5.1 on 2026-10-17 23:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0012_notification_attendance_auto_closed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Shift',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('start_time', models.TimeField()),
+                ('duration', models.DurationField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Schedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekdays', models.CharField(default='01234', max_length=7)),
+                ('valid_from', models.DateField()),
+                ('valid_until', models.DateField(blank=True, null=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('shift', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='attendance.shift')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['employee', 'valid_from'], name='attendance__employe_b6ba29_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExpectedPresence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('work_date', models.DateField()),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('shift', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='attendance.shift')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['employee', 'start'], name='expected_employee_start_idx'), models.Index(fields=['work_date'], name='attendance__work_da_ea3551_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'work_date'), name='unique_expected_presence_per_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1 on 2026-10-17 23:33
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+from django.utils import timezone
+
+
+def open_inactive_periods(apps, schema_editor):
+    """
+    Opens a period for every account deactivated before periods were
+    recorded, from the day after its last attendance, or from the day it
+    joined when it has none.
+    """
+    User = apps.get_model('attendance', 'User')
+    InactivePeriod = apps.get_model('attendance', 'InactivePeriod')
+    users = User.objects.filter(is_active=False).annotate(last_day=Max('attendance__work_date'))
+    InactivePeriod.objects.bulk_create([
+        InactivePeriod(
+            employee_id=user.pk,
+            start=user.last_day + timedelta(days=1) if user.last_day else timezone.localdate(user.date_joined),
+        )
+        for user in users
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0013_shift_schedule_expectedpresence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InactivePeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateField()),
+                ('end', models.DateField(blank=True, null=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['employee', 'start'], name='attendance__employe_9255ea_idx')],
+            },
+        ),
+        migrations.RunPython(open_inactive_periods, migrations.RunPython.noop),
+    ]
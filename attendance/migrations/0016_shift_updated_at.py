@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-17 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0015_retentioncutoff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shift',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -7,17 +9,286 @@ class User(AbstractUser):
         ('employee', 'Employee'),
     )
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='employee')
+    # Embedded in issued JWTs; bumping it revokes every token issued before
+    token_version = models.PositiveIntegerField(default=0)
+
+    # Copied into issued tokens or checked against them; changing one revokes the tokens
+    TOKEN_CLAIM_FIELDS = ('role', 'is_superuser', 'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._token_claims = user.token_claims()
+        return user
+
+    def token_claims(self):
+        # Deferred fields are left out rather than loaded
+        return {field: self.__dict__[field] for field in self.TOKEN_CLAIM_FIELDS if field in self.__dict__}
+
+    def revoke_tokens(self):
+        self.token_version += 1
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        loaded = getattr(self, '_token_claims', None)
+        if loaded is not None:
+            claims = self.token_claims()
+            if any(claims.get(field, value) != value for field, value in loaded.items()):
+                self.revoke_tokens()
+                if kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {*kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        if 'is_active' in self.__dict__:
+            was_active = True if adding else (loaded or {}).get('is_active', self.is_active)
+            if was_active != self.is_active:
+                InactivePeriod.record(self)
+        self._token_claims = self.token_claims()
+
+
+class InactivePeriod(models.Model):
+    """Days an account was deactivated, on which the employee is not counted absent."""
+    employee = models.ForeignKey(User, on_delete=models.CASCADE)
+    start = models.DateField()
+    # Day of reactivation, excluded; open while the account is deactivated
+    end = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['employee', 'start']),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} inactive from {self.start} to {self.end or '-'}"
+
+    @classmethod
+    def record(cls, user):
+        """Opens a period when ``user`` is deactivated and closes it when reactivated."""
+        today = timezone.localdate()
+        if user.is_active:
+            cls.objects.filter(employee=user, end__isnull=True).update(end=today)
+        else:
+            cls.objects.create(employee=user, start=today)
+
+    @classmethod
+    def by_employee(cls):
+        """Returns ``{employee_id: [(start, end), ...]}`` of every period."""
+        periods = {}
+        for employee_id, start, end in cls.objects.values_list('employee_id', 'start', 'end'):
+            periods.setdefault(employee_id, []).append((start, end))
+        return periods
 
 
 class Attendance(models.Model):
     employee = models.ForeignKey(User, on_delete=models.CASCADE)
     checkin_time = models.DateTimeField(null=True, blank=True)
     checkout_time = models.DateTimeField(null=True, blank=True)
+    # Day the matched shift starts (ExpectedPresence.work_date_for), else the local day of the check-in;
+    # denormalized so per-day lookups hit an index
+    work_date = models.DateField()
+    # Office whose geofence the check-in was made from
+    office = models.ForeignKey('OfficeLocation', null=True, blank=True, on_delete=models.SET_NULL)
+    # Part of the data version of cached reports; bulk updates must set it explicitly
+    updated_at = models.DateTimeField(auto_now=True)
+    # Check-out filled in by the scheduler for a session left open
+    auto_closed = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'work_date'], name='unique_attendance_per_day'),
+        ]
+        indexes = [
+            # Day ranges across all employees: admin date drill-down and its default ordering
+            models.Index(fields=['work_date', 'employee'], name='attendance_day_employee_idx'),
+            # An employee's own history, newest first: keyset pages of /api/me/attendance/
+            models.Index(fields=['employee', 'checkin_time'], name='attendance_emp_checkin_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee.username} - {self.checkin_time} to {self.checkout_time}"
+
+    def save(self, *args, **kwargs):
+        if self.work_date is None and self.checkin_time is not None:
+            self.work_date = ExpectedPresence.work_date_for(self.employee_id, self.checkin_time)
+        super().save(*args, **kwargs)
     
 class OfficeLocation(models.Model):
     latitude = models.DecimalField(max_digits=9, decimal_places=6)
     longitude = models.DecimalField(max_digits=9, decimal_places=6)
-    radius = models.DecimalField(max_digits=6, decimal_places=2)  
\ No newline at end of file
+    radius = models.DecimalField(max_digits=6, decimal_places=2, help_text='Geofence radius in kilometers.')
+
+
+class DailyAttendanceSummary(models.Model):
+    STATUS_CHOICES = (
+        ('present', 'Present'),
+        ('incomplete', 'Incomplete'),
+        ('absent', 'Absent'),
+    )
+    employee = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    first_in = models.DateTimeField(null=True, blank=True)
+    last_out = models.DateTimeField(null=True, blank=True)
+    worked_seconds = models.PositiveIntegerField(default=0)
+    is_late = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='absent')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'date'], name='unique_summary_per_day'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.date}: {self.status}"
+
+
+class RetentionCutoff(models.Model):
+    """Recorded when the retention policy drops attendance: rows before ``cutoff`` are gone, their summaries kept."""
+    cutoff = models.DateField(unique=True)
+    applied_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Attendance dropped before {self.cutoff}"
+
+    @classmethod
+    def latest(cls):
+        """First day that still has attendance rows, or None if nothing was dropped."""
+        return cls.objects.aggregate(latest=models.Max('cutoff'))['latest']
+
+
+class ReportJob(models.Model):
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+    FORMAT_CHOICES = (
+        ('xlsx', 'Excel'),
+        ('csv', 'CSV'),
+        ('parquet', 'Parquet'),
+    )
+    requested_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='xlsx')
+    data_version = models.CharField(max_length=32)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    file_path = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['start_date', 'end_date', 'format', 'data_version']),
+        ]
+
+    def __str__(self):
+        return f"Report {self.start_date} to {self.end_date}: {self.status}"
+
+
+class Notification(models.Model):
+    """Outbox of scheduler findings, read by clients polling for ids after the last one they saw."""
+    KIND_CHOICES = (
+        ('absent', 'Absent'),
+        ('missing_checkout', 'Missing check-out'),
+        ('auto_closed', 'Session auto-closed'),
+    )
+    employee = models.ForeignKey(User, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    date = models.DateField()
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Repeated scheduler runs report each finding once
+            models.UniqueConstraint(fields=['employee', 'date', 'kind'], name='unique_notification_per_day'),
+        ]
+        indexes = [
+            models.Index(fields=['employee', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.date}: {self.kind}"
+
+
+class Shift(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    start_time = models.TimeField()
+    # May run past midnight, e.g. a night shift from 22:00 for 8 hours
+    duration = models.DurationField()
+    # Part of the data version of cached reports, which print shift names
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.start_time:%H:%M}, {self.duration})"
+
+
+class Schedule(models.Model):
+    """Assigns a shift to an employee on some weekdays for a period."""
+    employee = models.ForeignKey(User, on_delete=models.CASCADE)
+    shift = models.ForeignKey(Shift, on_delete=models.CASCADE)
+    # Weekdays the shift is worked, Monday being 0, e.g. '01234'
+    weekdays = models.CharField(max_length=7, default='01234')
+    valid_from = models.DateField()
+    valid_until = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['employee', 'valid_from']),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.shift_id} from {self.valid_from}"
+
+
+class ExpectedPresence(models.Model):
+    """
+    One scheduled shift instance, generated in bulk from the schedules.
+    ``work_date`` is the day the shift starts, also for shifts ending after
+    midnight.
+    """
+    employee = models.ForeignKey(User, on_delete=models.CASCADE)
+    shift = models.ForeignKey(Shift, on_delete=models.CASCADE)
+    work_date = models.DateField()
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'work_date'], name='unique_expected_presence_per_day'),
+        ]
+        indexes = [
+            # Matches a punch to its shift instance
+            models.Index(fields=['employee', 'start'], name='expected_employee_start_idx'),
+            models.Index(fields=['work_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.work_date}: {self.start} to {self.end}"
+
+    @classmethod
+    def matching(cls, employee_id, timestamp):
+        """Shift instances of the employee a punch at ``timestamp`` may belong to, latest first."""
+        window = settings.ATTENDANCE_SHIFT_MATCH_WINDOW
+        return cls.objects.filter(
+            employee_id=employee_id, start__lte=timestamp + window, end__gte=timestamp - window,
+        ).order_by('-start').values_list('work_date', flat=True)
+
+    @classmethod
+    def work_date_for(cls, employee_id, timestamp):
+        """
+        Work date of the shift instance a punch at ``timestamp`` belongs to,
+        so a night shift's check-out counts towards the day it started. Falls
+        back to the local calendar day when no shift instance is near.
+        """
+        return cls.matching(employee_id, timestamp).first() or timezone.localdate(timestamp)
+
+    @classmethod
+    async def awork_date_for(cls, employee_id, timestamp):
+        return await cls.matching(employee_id, timestamp).afirst() or timezone.localdate(timestamp)
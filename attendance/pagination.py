@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class AttendanceCursorPagination(CursorPagination):
+    # Seeks on attendance_emp_checkin_idx, so deep pages cost the same as the first
+    ordering = '-checkin_time'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+def estimated_row_count(connection, table):
+    """
+    Returns the planner's row estimate for ``table`` from ``pg_class``. A
+    partitioned table keeps no estimate of its own, so those of its
+    partitions are added up.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint FROM pg_class c "
+            "WHERE c.oid = to_regclass(%s) "
+            "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s))",
+            [table, table],
+        )
+        return cursor.fetchone()[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin paginator that skips the full ``COUNT(*)`` of an unfiltered
+    changelist on PostgreSQL once the table is estimated to hold more than
+    ``ADMIN_EXACT_COUNT_LIMIT`` rows. Filtered lists, small tables and
+    other databases are counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            estimate = estimated_row_count(connection, queryset.model._meta.db_table)
+            if estimate > settings.ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+        return queryset.count()
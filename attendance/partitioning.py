@@ -0,0 +1,222 @@
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Attendance, RetentionCutoff
+from .summaries import rebuild_summaries
+
+TABLE = Attendance._meta.db_table
+MONTH_PARTITION = TABLE + '_p{:04d}_{:02d}'
+YEAR_PARTITION = TABLE + '_y{:04d}'
+DEFAULT_PARTITION = TABLE + '_default'
+
+
+def is_supported():
+    return connection.vendor == 'postgresql'
+
+
+def add_months(day, months):
+    month = day.year * 12 + day.month - 1 + months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def is_partitioned(cursor):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+    row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def partitions(cursor):
+    """Returns the names of the current partitions of the attendance table."""
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname",
+        [TABLE],
+    )
+    return [name for name, in cursor.fetchall()]
+
+
+def create_partition(cursor, name, start, end):
+    quote = connection.ops.quote_name
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(TABLE)} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def ensure_partitions(cursor, first_month, months_ahead):
+    """Creates the monthly partitions from ``first_month`` up to ``months_ahead`` months after this one."""
+    last_month = add_months(timezone.localdate().replace(day=1), months_ahead)
+    existing = set(partitions(cursor))
+    created = []
+    month = first_month
+    while month <= last_month:
+        name = MONTH_PARTITION.format(month.year, month.month)
+        # Months folded into a yearly archive are already covered
+        if name not in existing and YEAR_PARTITION.format(month.year) not in existing:
+            create_partition(cursor, name, month, add_months(month, 1))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def convert_table(months_ahead):
+    """
+    Rebuilds the plain attendance table as one range-partitioned by
+    ``work_date`` in a single transaction: a partition per month, a default
+    partition for rows outside every range, and the rows, constraints,
+    indexes and id sequence of the old table.
+    The primary key becomes ``(id, work_date)``, as PostgreSQL requires the
+    partition key in every unique constraint; ids stay unique through the
+    sequence. Returns the created partition names.
+    """
+    quote = connection.ops.quote_name
+    old_table = TABLE + '_unpartitioned'
+    with transaction.atomic(), connection.cursor() as cursor:
+        if is_partitioned(cursor):
+            return []
+        cursor.execute(f"LOCK TABLE {quote(TABLE)} IN ACCESS EXCLUSIVE MODE")
+
+        # Constraints other than the primary key, and indexes that back no constraint
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('u', 'f', 'c', 'x')",
+            [TABLE],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "WHERE i.indrelid = to_regclass(%s) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)",
+            [TABLE],
+        )
+        indexes = [definition for definition, in cursor.fetchall()]
+        cursor.execute(f"SELECT MIN(work_date), COALESCE(MAX(id), 0) FROM {quote(TABLE)}")
+        first_day, last_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} RENAME TO {quote(old_table)}")
+        cursor.execute(
+            f"CREATE TABLE {quote(TABLE)} (LIKE {quote(old_table)} INCLUDING DEFAULTS INCLUDING STORAGE) "
+            f"PARTITION BY RANGE (work_date)"
+        )
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} ALTER COLUMN id DROP DEFAULT")
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} ADD PRIMARY KEY (id, work_date)")
+        cursor.execute(f"CREATE TABLE {quote(DEFAULT_PARTITION)} PARTITION OF {quote(TABLE)} DEFAULT")
+        first_month = (first_day or timezone.localdate()).replace(day=1)
+        created = ensure_partitions(cursor, first_month, months_ahead)
+
+        # Ordered so each partition is written clustered by day and employee
+        cursor.execute(
+            f"INSERT INTO {quote(TABLE)} SELECT * FROM {quote(old_table)} ORDER BY work_date, employee_id"
+        )
+        # Frees the constraint and index names, and the id sequence owned by the old table
+        cursor.execute(f"DROP TABLE {quote(old_table)} CASCADE")
+
+        for name, definition in constraints:
+            cursor.execute(f"ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(name)} {definition}")
+        # Read before the rename, the definitions already name the new table
+        for definition in indexes:
+            cursor.execute(definition)
+
+        sequence = f'{TABLE}_id_seq'
+        cursor.execute(f"CREATE SEQUENCE {quote(sequence)} OWNED BY {quote(TABLE)}.id")
+        cursor.execute("SELECT setval(%s, %s, %s)", [sequence, max(last_id, 1), last_id > 0])
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        cursor.execute(f"ANALYZE {quote(TABLE)}")
+    return created
+
+
+def archive_year(cursor, year):
+    """
+    Folds the monthly partitions of a closed year into one yearly partition,
+    written in (work_date, employee) order so it stays compact.
+    """
+    quote = connection.ops.quote_name
+    existing = set(partitions(cursor))
+    months = [name for name in (MONTH_PARTITION.format(year, month) for month in range(1, 13)) if name in existing]
+    archive = YEAR_PARTITION.format(year)
+
+    for name in months:
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}")
+    cursor.execute(
+        f"CREATE TABLE {quote(archive)} (LIKE {quote(TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)"
+    )
+    if months:
+        union = ' UNION ALL '.join(f"SELECT * FROM {quote(name)}" for name in months)
+        cursor.execute(f"INSERT INTO {quote(archive)} {union} ORDER BY work_date, employee_id")
+    for name in months:
+        cursor.execute(f"DROP TABLE {quote(name)}")
+    # Attaching builds the partitioned indexes and checks the rows against the bounds
+    cursor.execute(
+        f"ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(archive)} "
+        f"FOR VALUES FROM ('{date(year, 1, 1).isoformat()}') TO ('{date(year + 1, 1, 1).isoformat()}')"
+    )
+    cursor.execute(f"ANALYZE {quote(archive)}")
+
+
+def archive_partitions(hot_months):
+    """
+    Archives every year whose months all lie before the last ``hot_months``
+    months. Returns the archived years.
+    """
+    cutoff = add_months(timezone.localdate().replace(day=1), -hot_months)
+    archived = []
+    with connection.cursor() as cursor:
+        names = set(partitions(cursor))
+    years = sorted({int(name[-7:-3]) for name in names if name.startswith(TABLE + '_p')})
+    for year in years:
+        if date(year + 1, 1, 1) > cutoff:
+            break
+        with transaction.atomic(), connection.cursor() as cursor:
+            archive_year(cursor, year)
+        archived.append(year)
+    return archived
+
+
+def apply_retention(retention_years):
+    """
+    Drops the yearly archives older than ``retention_years`` full years once
+    their daily summaries are rebuilt, so the totals stay reportable, and
+    records the cutoff so later rebuilds leave those summaries alone.
+    Returns the dropped years.
+    """
+    quote = connection.ops.quote_name
+    oldest_kept = timezone.localdate().year - retention_years
+    with connection.cursor() as cursor:
+        names = partitions(cursor)
+    dropped = []
+    for name in names:
+        if not name.startswith(TABLE + '_y'):
+            continue
+        year = int(name[-4:])
+        if year >= oldest_kept:
+            continue
+        with transaction.atomic():
+            rebuild_summaries(date(year, 1, 1), date(year, 12, 31))
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}")
+                cursor.execute(f"DROP TABLE {quote(name)}")
+            RetentionCutoff.objects.get_or_create(cutoff=date(year + 1, 1, 1))
+        dropped.append(year)
+    return dropped
+
+
+def maintain_partitions():
+    """
+    Creates upcoming months, archives closed years and applies the
+    retention policy. Returns None without touching anything when the table
+    has not been converted to a partitioned one.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not is_partitioned(cursor):
+            return None
+        created = ensure_partitions(
+            cursor, timezone.localdate().replace(day=1), settings.ATTENDANCE_PARTITION_MONTHS_AHEAD
+        )
+    archived = archive_partitions(settings.ATTENDANCE_PARTITION_HOT_MONTHS)
+    dropped = []
+    if settings.ATTENDANCE_RETENTION_YEARS is not None:
+        dropped = apply_retention(settings.ATTENDANCE_RETENTION_YEARS)
+    return created, archived, dropped
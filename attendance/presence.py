@@ -0,0 +1,215 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Attendance, User
+from .versioning import USERS_VERSION_KEY, get_version
+
+PRESENCE_SEQUENCE_KEY = 'presence:{}:sequence'
+PRESENCE_EVENT_KEY = 'presence:{}:event:{}'
+EVENT_TIMEOUT = 2 * 24 * 60 * 60
+# Changes kept in memory for stream clients that fall behind
+HISTORY_SIZE = 1000
+HEARTBEAT_INTERVAL = 15
+
+
+def presence_status(checkin_time, checkout_time):
+    if checkin_time is None:
+        return 'absent'
+    return 'checked_out' if checkout_time else 'checked_in'
+
+
+def presence_entry(employee_id, checkin_time=None, checkout_time=None):
+    return {
+        "employee_id": employee_id,
+        "status": presence_status(checkin_time, checkout_time),
+        "checkin_time": timezone.localtime(checkin_time).isoformat() if checkin_time else None,
+        "checkout_time": timezone.localtime(checkout_time).isoformat() if checkout_time else None,
+    }
+
+
+def publish_presence(changes):
+    """
+    Announces ``(employee_id, work_date, checkin_time, checkout_time)``
+    changes to every process once the current transaction commits. Each
+    change of today gets the next number of the day's sequence in the cache.
+    """
+    today = timezone.localdate()
+    entries = [
+        presence_entry(employee_id, checkin_time, checkout_time)
+        for employee_id, work_date, checkin_time, checkout_time in changes if work_date == today
+    ]
+    if entries:
+        transaction.on_commit(lambda: store_events(today.isoformat(), entries))
+
+
+def store_events(day, entries):
+    key = PRESENCE_SEQUENCE_KEY.format(day)
+    cache.add(key, 0, EVENT_TIMEOUT)
+    last = cache.incr(key, len(entries))
+    cache.set_many(
+        {PRESENCE_EVENT_KEY.format(day, last - len(entries) + number): entry
+         for number, entry in enumerate(entries, start=1)},
+        EVENT_TIMEOUT,
+    )
+
+
+class PresenceBoard:
+    """
+    Today's presence of every employee, held in process memory. It catches
+    up with the changes published to the cache by any process and is
+    rebuilt from the database on first use, at day rollover, when users
+    change or when it missed changes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.day = None
+        self.sequence = 0
+        self.users_version = None
+        self.entries = {}
+        self.names = {}
+        self.history = deque(maxlen=HISTORY_SIZE)
+
+    def sync(self):
+        day = timezone.localdate().isoformat()
+        sequence = cache.get(PRESENCE_SEQUENCE_KEY.format(day), 0)
+        users_version = get_version(USERS_VERSION_KEY)
+        with self.lock:
+            if (day, users_version) != (self.day, self.users_version) or sequence < self.sequence:
+                self.rebuild(day, sequence, users_version)
+            elif sequence > self.sequence:
+                numbers = range(self.sequence + 1, sequence + 1)
+                keys = [PRESENCE_EVENT_KEY.format(day, number) for number in numbers]
+                events = cache.get_many(keys) if len(keys) <= HISTORY_SIZE else {}
+                if len(events) < len(keys):
+                    # Expired, evicted or not stored yet; the database is the source of truth
+                    self.rebuild(day, sequence, users_version)
+                else:
+                    for number, key in zip(numbers, keys):
+                        self.apply(number, events[key])
+        return self
+
+    def rebuild(self, day, sequence, users_version):
+        # The sequence is read before the rows, so changes racing the rebuild are applied again later
+        employees = User.objects.filter(role='employee', is_active=True).values_list('id', 'first_name', 'last_name')
+        records = Attendance.objects.filter(work_date=day).values_list(
+            'employee_id', 'employee__first_name', 'employee__last_name', 'checkin_time', 'checkout_time'
+        )
+        self.names = {employee_id: f"{first} {last}".strip() for employee_id, first, last in employees}
+        self.entries = {employee_id: presence_entry(employee_id) for employee_id in self.names}
+        for employee_id, first, last, checkin_time, checkout_time in records:
+            self.names[employee_id] = f"{first} {last}".strip()
+            self.entries[employee_id] = presence_entry(employee_id, checkin_time, checkout_time)
+        self.day, self.sequence, self.users_version = day, sequence, users_version
+        self.history.clear()
+
+    def apply(self, number, entry):
+        self.entries[entry['employee_id']] = entry
+        self.sequence = number
+        self.history.append((number, entry))
+
+    def describe(self, entry):
+        return {**entry, "employee": self.names.get(entry['employee_id'], '')}
+
+    def snapshot(self):
+        with self.lock:
+            employees = [self.describe(entry) for entry in self.entries.values()]
+            day, sequence = self.day, self.sequence
+        counts = {'absent': 0, 'checked_in': 0, 'checked_out': 0}
+        for entry in employees:
+            counts[entry['status']] += 1
+        return {"date": day, "sequence": sequence, "counts": counts, "employees": employees}
+
+    def changes_since(self, day, sequence):
+        """
+        Returns ``(sequence, changes)`` after the given position, where
+        ``changes`` are ``(number, entry)`` pairs, or None when the client
+        is too far behind for a delta.
+        """
+        with self.lock:
+            if day != self.day or sequence > self.sequence:
+                return self.sequence, None
+            if sequence == self.sequence:
+                return sequence, []
+            if not self.history or self.history[0][0] > sequence + 1:
+                return self.sequence, None
+            return self.sequence, [
+                (number, self.describe(entry)) for number, entry in self.history if number > sequence
+            ]
+
+
+board = PresenceBoard()
+
+
+def parse_event_id(event_id):
+    """Splits a ``Last-Event-ID`` of the form ``<date>:<sequence>``."""
+    day, _, sequence = (event_id or '').partition(':')
+    try:
+        return day, int(sequence)
+    except ValueError:
+        return None, 0
+
+
+def sse_message(event, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id else []
+    lines += [f"event: {event}", f"data: {json.dumps(data)}"]
+    return '\n'.join(lines) + '\n\n'
+
+
+def next_messages(day, sequence):
+    """Syncs the board and returns ``(messages, day, sequence)`` for a stream at the given position."""
+    board.sync()
+    new_sequence, changes = board.changes_since(day, sequence)
+    if changes is None:
+        snapshot = board.snapshot()
+        event_id = f"{snapshot['date']}:{snapshot['sequence']}"
+        return [sse_message('snapshot', snapshot, event_id)], snapshot['date'], snapshot['sequence']
+    messages = [sse_message('change', entry, f"{day}:{number}") for number, entry in changes]
+    return messages, day, new_sequence
+
+
+def presence_stream(last_event_id=None):
+    """
+    Server-sent events: a snapshot, then every change as it is published.
+    The stream ends after ``PRESENCE_STREAM_TIMEOUT`` seconds; clients
+    reconnect with ``Last-Event-ID`` and continue where they left off.
+    """
+    day, sequence = parse_event_id(last_event_id)
+    deadline = time.monotonic() + settings.PRESENCE_STREAM_TIMEOUT
+    last_sent = time.monotonic()
+    yield f"retry: {settings.PRESENCE_RETRY_MS}\n\n"
+    while time.monotonic() < deadline:
+        messages, day, sequence = next_messages(day, sequence)
+        if messages:
+            yield ''.join(messages)
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= HEARTBEAT_INTERVAL:
+            yield ': keep-alive\n\n'
+            last_sent = time.monotonic()
+        time.sleep(settings.PRESENCE_POLL_INTERVAL)
+
+
+async def apresence_stream(last_event_id=None):
+    """Async variant of :func:`presence_stream` for ASGI workers."""
+    day, sequence = parse_event_id(last_event_id)
+    deadline = time.monotonic() + settings.PRESENCE_STREAM_TIMEOUT
+    last_sent = time.monotonic()
+    yield f"retry: {settings.PRESENCE_RETRY_MS}\n\n"
+    while time.monotonic() < deadline:
+        messages, day, sequence = await sync_to_async(next_messages)(day, sequence)
+        if messages:
+            yield ''.join(messages)
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= HEARTBEAT_INTERVAL:
+            yield ': keep-alive\n\n'
+            last_sent = time.monotonic()
+        await asyncio.sleep(settings.PRESENCE_POLL_INTERVAL)
@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Attendance
+from .presence import publish_presence
+from .schedules import punch_work_dates
+from .summaries import refresh_summaries
+
+CHECK_IN = 'check_in'
+CHECK_OUT = 'check_out'
+
+Punch = namedtuple('Punch', ['index', 'employee_id', 'action', 'timestamp', 'office_id'])
+PunchResult = namedtuple('PunchResult', ['status', 'message'])
+
+
+def apply_punches(punches):
+    """
+    Applies a batch of check-in/check-out punches in timestamp order and
+    persists them with one ``bulk_create`` and one ``bulk_update`` inside a
+    single transaction. Returns a ``{punch.index: PunchResult}`` mapping.
+
+    Replaying a punch that was already stored with the same timestamp is
+    reported as a duplicate rather than an error, so clients can safely
+    resend a queue after a dropped connection.
+    """
+    results = {}
+    if not punches:
+        return results
+
+    employee_ids = {punch.employee_id for punch in punches}
+    # Keyed by punch; a night shift's check-out belongs to the day the shift started
+    punch_dates = punch_work_dates(punches)
+    work_dates = set(punch_dates.values())
+
+    with transaction.atomic():
+        records = {
+            (record.employee_id, record.work_date): record
+            for record in Attendance.objects.select_for_update().filter(
+                employee_id__in=employee_ids, work_date__in=work_dates
+            )
+        }
+        to_create, to_update = [], {}
+
+        for punch in sorted(punches, key=lambda p: (p.timestamp, p.index)):
+            work_date = punch_dates[punch.index]
+            record = records.get((punch.employee_id, work_date))
+
+            if punch.action == CHECK_IN:
+                if record is None:
+                    record = Attendance(
+                        employee_id=punch.employee_id, work_date=work_date,
+                        checkin_time=punch.timestamp, office_id=punch.office_id,
+                    )
+                    records[(punch.employee_id, work_date)] = record
+                    to_create.append(record)
+                    results[punch.index] = PunchResult('ok', "Check-in successful!")
+                elif record.checkin_time == punch.timestamp:
+                    results[punch.index] = PunchResult('duplicate', "Check-in already recorded.")
+                else:
+                    results[punch.index] = PunchResult('error', "Already checked in today!")
+
+            else:
+                if record is None:
+                    results[punch.index] = PunchResult('error', "No check-in found!")
+                elif record.checkout_time == punch.timestamp:
+                    results[punch.index] = PunchResult('duplicate', "Check-out already recorded.")
+                elif record.checkout_time:
+                    results[punch.index] = PunchResult('error', "Already checked out!")
+                elif record.checkin_time and punch.timestamp < record.checkin_time:
+                    results[punch.index] = PunchResult('error', "Check-out is earlier than check-in.")
+                else:
+                    record.checkout_time = punch.timestamp
+                    record.updated_at = timezone.now()
+                    if record.pk:
+                        to_update[record.pk] = record
+                    results[punch.index] = PunchResult('ok', "Check-out successful!")
+
+        Attendance.objects.bulk_create(to_create)
+        Attendance.objects.bulk_update(list(to_update.values()), ['checkout_time', 'updated_at'])
+        # Bulk writes skip the model signals that keep the daily summaries and presence current
+        changed = to_create + list(to_update.values())
+        refresh_summaries((record.employee_id, record.work_date) for record in changed)
+        publish_presence(
+            (record.employee_id, record.work_date, record.checkin_time, record.checkout_time) for record in changed
+        )
+
+    return results
+
+
+def correct_attendance(queryset, **values):
+    """
+    Applies ``values`` to every row of ``queryset`` in one UPDATE, then
+    refreshes the summaries and presence the bulk write bypasses. Returns
+    the ``(employee_id, work_date)`` pairs of the updated rows.
+    """
+    with transaction.atomic():
+        keys = list(queryset.select_for_update().values_list('employee_id', 'work_date'))
+        queryset.update(updated_at=timezone.now(), **values)
+        refresh_summaries(keys)
+        today = timezone.localdate()
+        publish_presence(Attendance.objects.filter(
+            work_date=today, employee_id__in=[employee_id for employee_id, day in keys if day == today]
+        ).values_list('employee_id', 'work_date', 'checkin_time', 'checkout_time'))
+    return keys
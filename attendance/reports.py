@@ -0,0 +1,197 @@
+import csv
+import os
+import tempfile
+from collections import namedtuple
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+
+from .models import Attendance, ExpectedPresence
+
+REPORT_COLUMNS = ['Employee', 'Shift', 'Check-in Time', 'Check-out Time']
+EXPORT_COLUMNS = ['Date'] + REPORT_COLUMNS
+COLUMN_WIDTH = 40  # Fixed width to display 40 characters
+STREAM_CHUNK_SIZE = 64 * 1024
+ITERATOR_CHUNK_SIZE = 2000
+
+
+def daterange(start_date, end_date):
+    for offset in range((end_date - start_date).days + 1):
+        yield start_date + timedelta(days=offset)
+
+
+def format_time(value):
+    if value is None:
+        return None
+    return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def shift_name():
+    """Name of the row's scheduled shift, looked up in the calendar through its unique index."""
+    return Subquery(ExpectedPresence.objects.filter(
+        employee_id=OuterRef('employee_id'), work_date=OuterRef('work_date'),
+    ).values('shift__name')[:1])
+
+
+def write_excel_report(start_date, end_date, output):
+    # The writer lives in its own module, which builds on the helpers here
+    from .excel import write_report
+
+    write_report(start_date, end_date, output)
+
+
+def export_rows(start_date, end_date):
+    """
+    Yields flat ``(date, first_name, last_name, shift, checkin, checkout)``
+    tuples for the range, read through a server-side cursor where supported.
+    """
+    return (
+        Attendance.objects
+        .filter(work_date__range=(start_date, end_date))
+        .order_by('work_date', 'checkin_time')
+        .values_list(
+            'work_date', 'employee__first_name', 'employee__last_name', shift_name(), 'checkin_time', 'checkout_time',
+        )
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+
+
+class Echo:
+    """File-like object handing back what ``csv.writer`` writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(start_date, end_date):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS).encode()
+    for work_date, first_name, last_name, shift, checkin_time, checkout_time in export_rows(start_date, end_date):
+        yield writer.writerow([
+            work_date, f"{first_name} {last_name}".strip(), shift, format_time(checkin_time),
+            format_time(checkout_time),
+        ]).encode()
+
+
+def write_csv_report(start_date, end_date, output):
+    for line in csv_lines(start_date, end_date):
+        output.write(line)
+
+
+def write_parquet_report(start_date, end_date, output):
+    """
+    Builds the Arrow columns in one pass over the rows and writes them as a
+    single Parquet row group.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    dates, names, shifts, checkins, checkouts = [], [], [], [], []
+    for work_date, first_name, last_name, shift, checkin_time, checkout_time in export_rows(start_date, end_date):
+        dates.append(work_date)
+        names.append(f"{first_name} {last_name}".strip())
+        shifts.append(shift)
+        checkins.append(checkin_time)
+        checkouts.append(checkout_time)
+
+    timestamp = pa.timestamp('us', tz=settings.TIME_ZONE)
+    table = pa.table({
+        'date': pa.array(dates, type=pa.date32()),
+        'employee': pa.array(names, type=pa.string()),
+        'shift': pa.array(shifts, type=pa.string()),
+        'checkin_time': pa.array(checkins, type=timestamp),
+        'checkout_time': pa.array(checkouts, type=timestamp),
+    })
+    pq.write_table(table, output, compression='zstd')
+
+
+ReportFormat = namedtuple('ReportFormat', ['writer', 'content_type'])
+
+REPORT_FORMATS = {
+    'xlsx': ReportFormat(write_excel_report, 'application/vnd.ms-excel'),
+    'csv': ReportFormat(write_csv_report, 'text/csv'),
+    'parquet': ReportFormat(write_parquet_report, 'application/vnd.apache.parquet'),
+}
+
+
+def report_filename(start_date, end_date, report_format):
+    return f"Attendance_Report_{start_date}_to_{end_date}.{report_format}"
+
+
+def stream_file(fileobj, chunk_size=STREAM_CHUNK_SIZE):
+    fileobj.seek(0)
+    try:
+        while chunk := fileobj.read(chunk_size):
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def read_chunk(iterator):
+    """Joins parts of ``iterator`` into one chunk of about ``STREAM_CHUNK_SIZE`` bytes, or None at its end."""
+    parts, size = [], 0
+    for part in iterator:
+        parts.append(part)
+        size += len(part)
+        if size >= STREAM_CHUNK_SIZE:
+            break
+    return b''.join(parts) if parts else None
+
+
+async def async_chunks(iterator):
+    """
+    Async view of a sync byte iterator. ASGI reads a sync iterator to its end
+    before sending anything, so streamed reports would be held in memory.
+    Chunks are read on the sync thread, where database cursors stay on
+    their connection.
+    """
+    try:
+        while (chunk := await sync_to_async(read_chunk)(iterator)) is not None:
+            yield chunk
+    finally:
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+
+def streaming_content(iterator):
+    return async_chunks(iterator) if settings.ATTENDANCE_ASYNC_VIEWS else iterator
+
+
+def report_response(start_date, end_date, report_format='xlsx'):
+    content_type = REPORT_FORMATS[report_format].content_type
+    if report_format == 'csv':
+        # Rows go out as they are read from the cursor, nothing is buffered
+        content = csv_lines(start_date, end_date)
+    else:
+        output = tempfile.TemporaryFile()
+        try:
+            REPORT_FORMATS[report_format].writer(start_date, end_date, output)
+        except Exception:
+            output.close()
+            raise
+        content = stream_file(output)
+
+    response = StreamingHttpResponse(streaming_content(content), content_type=content_type)
+    response['Content-Disposition'] = content_disposition_header(
+        True, report_filename(start_date, end_date, report_format)
+    )
+    return response
+
+
+def artifact_response(path, start_date, end_date, report_format):
+    """Serves a generated report file, streamed asynchronously under ASGI."""
+    content_type = REPORT_FORMATS[report_format].content_type
+    filename = report_filename(start_date, end_date, report_format)
+    artifact = open(path, 'rb')
+    if not settings.ATTENDANCE_ASYNC_VIEWS:
+        return FileResponse(artifact, as_attachment=True, content_type=content_type, filename=filename)
+
+    response = StreamingHttpResponse(async_chunks(stream_file(artifact)), content_type=content_type)
+    response['Content-Length'] = os.fstat(artifact.fileno()).st_size
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, FilteredRelation, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from .models import Attendance, ExpectedPresence, Notification, Schedule, User
+from .punches import correct_attendance
+from .schedules import expected_checkout
+from .summaries import is_workday, mark_absent
+
+
+def next_run(now, times):
+    """Returns the first of the local ``times`` after ``now``."""
+    now = timezone.localtime(now)
+    return min(
+        run for run in (
+            timezone.make_aware(datetime.combine(now.date() + timedelta(days=days), at))
+            for days in (0, 1) for at in times
+        ) if run > now
+    )
+
+
+def find_absences(now):
+    """
+    Returns ``(absent, open_sessions)`` as ``(employee_id, work_date)``
+    pairs, found set-based: one query over the shift instances of yesterday
+    and today that have begun, and one anti-join for unscheduled employees
+    on a default workday. Absence counts once the shift start plus grace has
+    passed; an open session once the shift has ended.
+    """
+    day = timezone.localdate(now)
+    grace = settings.ATTENDANCE_LATE_GRACE
+    absent, open_sessions = [], []
+
+    records = Attendance.objects.filter(employee_id=OuterRef('employee_id'), work_date=OuterRef('work_date'))
+    instances = (
+        ExpectedPresence.objects
+        .filter(work_date__in=[day - timedelta(days=1), day], start__lte=now - grace,
+                employee__role='employee', employee__is_active=True)
+        .annotate(record_id=Subquery(records.values('id')[:1]),
+                  record_checkout=Subquery(records.values('checkout_time')[:1]))
+        .filter(Q(record_id__isnull=True) | Q(record_checkout__isnull=True))
+        .values_list('employee_id', 'work_date', 'end', 'record_id')
+    )
+    for employee_id, work_date, end, record_id in instances:
+        if record_id is None:
+            absent.append((employee_id, work_date))
+        elif end <= now:
+            open_sessions.append((employee_id, work_date))
+
+    shift_start = timezone.make_aware(datetime.combine(day, settings.ATTENDANCE_SHIFT_START))
+    if is_workday(day) and now >= shift_start + grace:
+        rows = (
+            User.objects.filter(role='employee', is_active=True)
+            .exclude(Exists(Schedule.objects.filter(employee=OuterRef('pk'))))
+            .annotate(day_record=FilteredRelation('attendance', condition=Q(attendance__work_date=day)))
+            .filter(Q(day_record__id__isnull=True) | Q(day_record__checkout_time__isnull=True))
+            .values_list('id', 'day_record__id')
+        )
+        shift_over = now >= shift_start + settings.ATTENDANCE_STANDARD_DAY
+        for employee_id, record_id in rows:
+            if record_id is None:
+                absent.append((employee_id, day))
+            elif shift_over:
+                open_sessions.append((employee_id, day))
+    return absent, open_sessions
+
+
+def close_stale_sessions(now):
+    """
+    Closes every session left open for longer than
+    ``ATTENDANCE_AUTO_CLOSE_AFTER`` at the end of its shift, or a standard
+    working day after check-in, in one UPDATE. Returns the ``(employee_id, work_date)`` pairs closed.
+    """
+    if settings.ATTENDANCE_AUTO_CLOSE_AFTER is None:
+        return []
+    return correct_attendance(
+        Attendance.objects.filter(
+            checkout_time__isnull=True, checkin_time__lt=now - settings.ATTENDANCE_AUTO_CLOSE_AFTER
+        ),
+        checkout_time=expected_checkout(),
+        auto_closed=True,
+    )
+
+
+def run_checks(now=None):
+    """
+    Auto-closes stale sessions, then reports absentees and open sessions
+    found by :func:`find_absences`. Findings go to the notifications outbox;
+    a finding already reported is skipped. Absentees also get an ``absent``
+    daily summary, so monthly totals count them before the next rebuild.
+    Returns the number of findings per kind.
+    """
+    now = now or timezone.now()
+    findings = {}
+
+    with transaction.atomic():
+        findings['auto_closed'] = close_stale_sessions(now)
+        findings['absent'], findings['missing_checkout'] = find_absences(now)
+        mark_absent(findings['absent'])
+
+        messages = {
+            'absent': "No check-in on {}.",
+            'missing_checkout': "Still checked in, no check-out on {}.",
+            'auto_closed': "Check-out on {} was missing and has been filled in automatically.",
+        }
+        Notification.objects.bulk_create(
+            [
+                Notification(employee_id=employee_id, kind=kind, date=work_date,
+                             message=messages[kind].format(work_date.isoformat()))
+                for kind, keys in findings.items() for employee_id, work_date in keys
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+    return {kind: len(keys) for kind, keys in findings.items()}
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import ExpectedPresence, Schedule
+
+BATCH_SIZE = 1000
+
+
+def build_calendar(start_date, end_date, employee_ids=None):
+    """
+    Regenerates the expected presence between the dates from the schedules,
+    for every employee or only the given ones, with one query for the
+    schedules, one DELETE and batched INSERTs. Where schedules overlap, the
+    one valid from the latest date wins. Returns the number of shift instances.
+    """
+    schedules = Schedule.objects.select_related('shift').filter(
+        Q(valid_until__isnull=True) | Q(valid_until__gte=start_date), valid_from__lte=end_date,
+    ).order_by('valid_from', 'id')
+    existing = ExpectedPresence.objects.filter(work_date__range=(start_date, end_date))
+    if employee_ids is not None:
+        schedules = schedules.filter(employee_id__in=employee_ids)
+        existing = existing.filter(employee_id__in=employee_ids)
+
+    instances = {}
+    for schedule in schedules:
+        weekdays = {int(day) for day in schedule.weekdays}
+        day = max(schedule.valid_from, start_date)
+        last_day = min(schedule.valid_until or end_date, end_date)
+        while day <= last_day:
+            if day.weekday() in weekdays:
+                start = timezone.make_aware(datetime.combine(day, schedule.shift.start_time))
+                instances[(schedule.employee_id, day)] = ExpectedPresence(
+                    employee_id=schedule.employee_id, shift_id=schedule.shift_id, work_date=day,
+                    start=start, end=start + schedule.shift.duration,
+                )
+            day += timedelta(days=1)
+
+    with transaction.atomic():
+        existing.delete()
+        ExpectedPresence.objects.bulk_create(instances.values(), batch_size=BATCH_SIZE)
+    return len(instances)
+
+
+def extend_calendar(days=None):
+    """
+    Generates the calendar from the day after the last generated one up to
+    ``days`` (default ``ATTENDANCE_CALENDAR_DAYS``) days from today. Returns
+    the number of new shift instances.
+    """
+    today = timezone.localdate()
+    end_date = today + timedelta(days=days or settings.ATTENDANCE_CALENDAR_DAYS)
+    last_day = ExpectedPresence.objects.aggregate(last_day=Max('work_date'))['last_day']
+    start_date = max(last_day + timedelta(days=1), today) if last_day else today
+    if start_date > end_date:
+        return 0
+    return build_calendar(start_date, end_date)
+
+
+def refresh_calendar(employee_ids):
+    """Regenerates the upcoming calendar of employees whose schedules changed; past days are kept."""
+    today = timezone.localdate()
+    return build_calendar(today, today + timedelta(days=settings.ATTENDANCE_CALENDAR_DAYS), employee_ids)
+
+
+def punch_work_dates(punches):
+    """
+    Returns ``{punch.index: work_date}`` for a batch of punches, matched to
+    shift instances read with one query, like
+    :meth:`ExpectedPresence.work_date_for` does for a single punch.
+    """
+    if not punches:
+        return {}
+    window = settings.ATTENDANCE_SHIFT_MATCH_WINDOW
+    timestamps = [punch.timestamp for punch in punches]
+    instances = {}
+    for employee_id, work_date, start, end in ExpectedPresence.objects.filter(
+        employee_id__in={punch.employee_id for punch in punches},
+        start__lte=max(timestamps) + window, end__gte=min(timestamps) - window,
+    ).values_list('employee_id', 'work_date', 'start', 'end'):
+        instances.setdefault(employee_id, []).append((start, end, work_date))
+
+    work_dates = {}
+    for punch in punches:
+        matches = [
+            (start, work_date) for start, end, work_date in instances.get(punch.employee_id, ())
+            if start - window <= punch.timestamp <= end + window
+        ]
+        work_dates[punch.index] = max(matches)[1] if matches else timezone.localdate(punch.timestamp)
+    return work_dates
+
+
+def expected_starts(**filters):
+    """Returns ``{(employee_id, work_date): start}`` of the shift instances matching ``filters``."""
+    return {
+        (employee_id, work_date): start
+        for employee_id, work_date, start in ExpectedPresence.objects.filter(**filters).values_list(
+            'employee_id', 'work_date', 'start'
+        )
+    }
+
+
+def scheduled_employee_ids(**filters):
+    """Employees with a schedule, whose expected days come from the calendar instead of ATTENDANCE_WORKDAYS."""
+    return set(Schedule.objects.filter(**filters).values_list('employee_id', flat=True).distinct())
+
+
+def expected_checkout():
+    """
+    Expression for the check-out to fill in on an open session: the end of
+    its shift instance, or a standard working day after check-in on an
+    unscheduled day, and never before the check-in.
+    """
+    shift_end = ExpectedPresence.objects.filter(
+        employee_id=OuterRef('employee_id'), work_date=OuterRef('work_date'),
+    ).values('end')[:1]
+    return Greatest(
+        Coalesce(Subquery(shift_end), F('checkin_time') + settings.ATTENDANCE_STANDARD_DAY), F('checkin_time'),
+    )
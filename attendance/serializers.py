@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Attendance, User
+from .punches import CHECK_IN, CHECK_OUT
 
 
 class AttendanceSerializer(serializers.ModelSerializer):
@@ -12,7 +13,7 @@ class PasswordChangeSerializer(serializers.Serializer):
     new_password = serializers.CharField(required=True, write_only=True)
 
     def validate_current_password(self, value):
-        user = self.context['request'].user
+        user = self.context['user']
         if not user.check_password(value):
             raise serializers.ValidationError("Current password is incorrect.")
         return value
@@ -22,10 +23,19 @@ class PasswordChangeSerializer(serializers.Serializer):
 
     def update_password(self, user):
         user.set_password(self.validated_data['new_password'])
+        user.revoke_tokens()
         user.save()
 
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'first_name', 'last_name', 'email']
\ No newline at end of file
+        fields = ['id', 'first_name', 'last_name', 'email']
+
+
+class PunchSerializer(serializers.Serializer):
+    employee_id = serializers.IntegerField(required=False)
+    action = serializers.ChoiceField(choices=[CHECK_IN, CHECK_OUT])
+    timestamp = serializers.DateTimeField()
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import forget_token_version
+from .geofence import invalidate_office_index
+from .models import Attendance, OfficeLocation, Schedule, Shift, User
+from .presence import publish_presence
+from .schedules import refresh_calendar
+from .summaries import refresh_summaries, summarize_attendance
+from .versioning import USERS_VERSION_KEY, bump_version
+
+
+@receiver([post_save, post_delete], sender=OfficeLocation)
+def office_location_changed(sender, **kwargs):
+    # Bumped before commit, another worker could rebuild from the old rows and keep them under the new version
+    transaction.on_commit(invalidate_office_index)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Password changes and deactivation must reach the token check as soon as they commit; forgetting
+    # the version earlier lets a concurrent request cache the old one again
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_token_version(user_id))
+    # Likewise, a list read before the commit must not be cached under the new version
+    transaction.on_commit(lambda: bump_version(USERS_VERSION_KEY))
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, **kwargs):
+    summarize_attendance(instance)
+    publish_presence([(instance.employee_id, instance.work_date, instance.checkin_time, instance.checkout_time)])
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_deleted(sender, instance, **kwargs):
+    refresh_summaries([(instance.employee_id, instance.work_date)])
+    publish_presence([(instance.employee_id, instance.work_date, None, None)])
+
+
+@receiver([post_save, post_delete], sender=Schedule)
+def schedule_changed(sender, instance, **kwargs):
+    refresh_calendar([instance.employee_id])
+
+
+@receiver(post_save, sender=Shift)
+def shift_changed(sender, instance, **kwargs):
+    refresh_calendar(list(instance.schedule_set.values_list('employee_id', flat=True)))
@@ -0,0 +1,199 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Attendance, DailyAttendanceSummary, ExpectedPresence, InactivePeriod, RetentionCutoff, User
+from .schedules import expected_starts, scheduled_employee_ids
+
+SUMMARY_FIELDS = ['first_in', 'last_out', 'worked_seconds', 'is_late', 'status']
+BATCH_SIZE = 1000
+REBUILD_CHUNK_DAYS = 31
+
+
+def is_workday(day):
+    return day.weekday() in settings.ATTENDANCE_WORKDAYS
+
+
+def is_expected(employee_id, day, expected, scheduled):
+    """Whether the employee was due on ``day``: per the calendar when scheduled, else on every workday."""
+    if employee_id in scheduled:
+        return (employee_id, day) in expected
+    return is_workday(day)
+
+
+def is_late(work_date, first_in, shift_start=None):
+    shift_start = shift_start or timezone.make_aware(datetime.combine(work_date, settings.ATTENDANCE_SHIFT_START))
+    return first_in > shift_start + settings.ATTENDANCE_LATE_GRACE
+
+
+def build_summary(employee_id, work_date, first_in, last_out, shift_start=None):
+    summary = DailyAttendanceSummary(employee_id=employee_id, date=work_date, first_in=first_in, last_out=last_out)
+    if first_in is None:
+        summary.status = 'absent'
+    else:
+        summary.is_late = is_late(work_date, first_in, shift_start)
+        if last_out is None:
+            summary.status = 'incomplete'
+        else:
+            summary.status = 'present'
+            summary.worked_seconds = max(int((last_out - first_in).total_seconds()), 0)
+    return summary
+
+
+def summarize_attendance(record):
+    """
+    Upserts the summary of a saved attendance row in one statement. An
+    employee has one row per day, so the summary is built from the row and
+    its shift instance without reading the day back.
+    """
+    if record.checkin_time is None:
+        refresh_summaries([(record.employee_id, record.work_date)])
+        return
+    shift_start = ExpectedPresence.objects.filter(
+        employee_id=record.employee_id, work_date=record.work_date,
+    ).values_list('start', flat=True).first()
+    DailyAttendanceSummary.objects.bulk_create(
+        [build_summary(record.employee_id, record.work_date, record.checkin_time, record.checkout_time, shift_start)],
+        update_conflicts=True, unique_fields=['employee', 'date'], update_fields=SUMMARY_FIELDS,
+    )
+
+
+def refresh_summaries(keys):
+    """
+    Recomputes the summaries of the given ``(employee_id, work_date)`` pairs
+    from their attendance rows and upserts them in one statement.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+
+    employee_ids = {employee_id for employee_id, _ in keys}
+    work_dates = {work_date for _, work_date in keys}
+    records = {
+        (employee_id, work_date): (checkin_time, checkout_time)
+        for employee_id, work_date, checkin_time, checkout_time in Attendance.objects.filter(
+            employee_id__in=employee_ids, work_date__in=work_dates
+        ).values_list('employee_id', 'work_date', 'checkin_time', 'checkout_time')
+    }
+
+    expected = expected_starts(employee_id__in=employee_ids, work_date__in=work_dates)
+    scheduled = scheduled_employee_ids(employee_id__in=employee_ids)
+
+    summaries, stale = [], []
+    for employee_id, work_date in keys:
+        first_in, last_out = records.get((employee_id, work_date), (None, None))
+        if first_in is None and not is_expected(employee_id, work_date, expected, scheduled):
+            stale.append((employee_id, work_date))
+        else:
+            summaries.append(build_summary(
+                employee_id, work_date, first_in, last_out, expected.get((employee_id, work_date))
+            ))
+
+    DailyAttendanceSummary.objects.bulk_create(
+        summaries, update_conflicts=True, unique_fields=['employee', 'date'], update_fields=SUMMARY_FIELDS,
+    )
+    for employee_id, work_date in stale:
+        DailyAttendanceSummary.objects.filter(employee_id=employee_id, date=work_date).delete()
+
+
+def mark_absent(keys):
+    """Upserts ``absent`` summaries for ``(employee_id, work_date)`` pairs found without attendance."""
+    DailyAttendanceSummary.objects.bulk_create(
+        [build_summary(employee_id, work_date, None, None) for employee_id, work_date in keys],
+        batch_size=BATCH_SIZE, update_conflicts=True, unique_fields=['employee', 'date'],
+        update_fields=SUMMARY_FIELDS,
+    )
+
+
+def was_employed(employee_id, day, joined, inactive):
+    """Whether the account existed and was active on ``day``."""
+    return day >= joined[employee_id] and not any(
+        start <= day and (end is None or day < end) for start, end in inactive.get(employee_id, ())
+    )
+
+
+def rebuild_summaries(start_date, end_date):
+    """
+    Rebuilds every summary in the range from aggregates computed in the
+    database, one chunk of days at a time. Employees with no attendance on
+    a past day they were expected get an ``absent`` row, unless they had
+    not joined yet or their account was deactivated. Days before the
+    retention cutoff have no attendance left, so their summaries are kept
+    and the range is clamped to start at the cutoff. Returns the row count.
+    """
+    cutoff = RetentionCutoff.latest()
+    if cutoff is not None:
+        start_date = max(start_date, cutoff)
+    joined = {
+        employee_id: timezone.localdate(date_joined)
+        for employee_id, date_joined in User.objects.filter(role='employee').values_list('id', 'date_joined')
+    }
+    inactive = InactivePeriod.by_employee()
+    scheduled = scheduled_employee_ids()
+    today = timezone.localdate()
+    total = 0
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=REBUILD_CHUNK_DAYS - 1), end_date)
+        aggregates = (
+            Attendance.objects
+            .filter(work_date__range=(chunk_start, chunk_end))
+            .values('employee_id', 'work_date')
+            .annotate(first_in=Min('checkin_time'), last_out=Max('checkout_time'))
+            .values_list('employee_id', 'work_date', 'first_in', 'last_out')
+        )
+        expected = expected_starts(work_date__range=(chunk_start, chunk_end))
+        summaries = [
+            build_summary(employee_id, work_date, first_in, last_out, expected.get((employee_id, work_date)))
+            for employee_id, work_date, first_in, last_out in aggregates
+        ]
+
+        present = {(summary.employee_id, summary.date) for summary in summaries}
+        day = chunk_start
+        # Nobody is absent on a day that has not happened yet
+        while day <= min(chunk_end, today):
+            summaries.extend(
+                DailyAttendanceSummary(employee_id=employee_id, date=day)
+                for employee_id in joined
+                if (employee_id, day) not in present and is_expected(employee_id, day, expected, scheduled)
+                and was_employed(employee_id, day, joined, inactive)
+            )
+            day += timedelta(days=1)
+
+        with transaction.atomic():
+            DailyAttendanceSummary.objects.filter(date__range=(chunk_start, chunk_end)).delete()
+            DailyAttendanceSummary.objects.bulk_create(summaries, batch_size=BATCH_SIZE)
+        total += len(summaries)
+        chunk_start = chunk_end + timedelta(days=1)
+    return total
+
+
+def monthly_summary(employee_id, month_start):
+    """Totals of one employee's daily summaries for the month starting at ``month_start``, in one query."""
+    month_end = (month_start + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+    standard_seconds = int(settings.ATTENDANCE_STANDARD_DAY.total_seconds())
+    totals = DailyAttendanceSummary.objects.filter(
+        employee_id=employee_id, date__range=(month_start, month_end)
+    ).aggregate(
+        present_days=Count('id', filter=Q(status='present')),
+        incomplete_days=Count('id', filter=Q(status='incomplete')),
+        absent_days=Count('id', filter=Q(status='absent')),
+        late_days=Count('id', filter=Q(is_late=True)),
+        worked_total=Sum('worked_seconds', default=0),
+        overtime_total=Sum(Greatest(F('worked_seconds') - standard_seconds, Value(0)), default=0),
+    )
+    present_days = totals['present_days']
+    return {
+        "month": month_start.strftime('%Y-%m'),
+        "present_days": present_days,
+        "incomplete_days": totals['incomplete_days'],
+        "absent_days": totals['absent_days'],
+        "late_days": totals['late_days'],
+        "worked_hours": round(totals['worked_total'] / 3600, 2),
+        "average_hours": round(totals['worked_total'] / present_days / 3600, 2) if present_days else 0,
+        "overtime_hours": round(totals['overtime_total'] / 3600, 2),
+    }
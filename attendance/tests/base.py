@@ -0,0 +1,35 @@
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from attendance.authentication import issue_tokens
+from attendance.models import OfficeLocation, User
+
+EVERY_DAY = (0, 1, 2, 3, 4, 5, 6)
+OFFICE = {'latitude': 41.3, 'longitude': 69.24}
+
+
+def at(day, hour, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+def authenticate(client, user):
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {issue_tokens(user).access_token}')
+
+
+class AttendanceAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        OfficeLocation.objects.create(radius=1, **OFFICE)
+        cls.employee = User.objects.create_user('employee', password='secret', first_name='Emma', last_name='Stone')
+        cls.admin = User.objects.create_user('admin', password='secret', role='admin', is_superuser=True)
+
+    def setUp(self):
+        # Token versions, cached lists and idempotency keys must not leak between tests
+        cache.clear()
+        caches[settings.IDEMPOTENCY_CACHE].clear()
+        authenticate(self.client, self.employee)
@@ -0,0 +1,52 @@
+from datetime import date, time, timedelta
+
+from attendance.models import Attendance, DailyAttendanceSummary, ExpectedPresence, Shift, User
+
+from .base import AttendanceAPITestCase, at
+
+CHANGELIST = '/admin/attendance/attendance/'
+
+
+class AttendanceAdminTests(AttendanceAPITestCase):
+    day = date(2024, 3, 4)
+
+    def setUp(self):
+        super().setUp()
+        User.objects.filter(pk=self.admin.pk).update(is_staff=True)
+        self.client.force_login(self.admin)
+
+    def run_action(self, action, *records):
+        return self.client.post(CHANGELIST, {'action': action, '_selected_action': [record.pk for record in records]})
+
+    def test_changelist_lists_attendance(self):
+        record = Attendance.objects.create(employee=self.employee, work_date=self.day, checkin_time=at(self.day, 9))
+        response = self.client.get(CHANGELIST)
+        self.assertContains(response, f'{CHANGELIST}{record.pk}/change/')
+
+    def test_open_sessions_close_at_the_end_of_their_shift(self):
+        night = Shift.objects.create(name='Night', start_time=time(22), duration=timedelta(hours=8))
+        ExpectedPresence.objects.create(employee=self.employee, shift=night, work_date=self.day,
+                                        start=at(self.day, 22), end=at(self.day + timedelta(days=1), 6))
+        scheduled = Attendance.objects.create(employee=self.employee, work_date=self.day,
+                                              checkin_time=at(self.day, 22))
+        other_day = self.day + timedelta(days=1)
+        unscheduled = Attendance.objects.create(employee=self.employee, work_date=other_day,
+                                                checkin_time=at(other_day, 9))
+
+        self.run_action('close_open_sessions', scheduled, unscheduled)
+
+        scheduled.refresh_from_db()
+        unscheduled.refresh_from_db()
+        self.assertEqual(scheduled.checkout_time, at(self.day + timedelta(days=1), 6))
+        self.assertEqual(unscheduled.checkout_time, at(other_day, 17))
+        summary = DailyAttendanceSummary.objects.get(employee=self.employee, date=other_day)
+        self.assertEqual(summary.worked_seconds, 8 * 3600)
+
+    def test_clear_checkout(self):
+        record = Attendance.objects.create(employee=self.employee, work_date=self.day, checkin_time=at(self.day, 9),
+                                           checkout_time=at(self.day, 17), auto_closed=True)
+        self.run_action('clear_checkout', record)
+        record.refresh_from_db()
+        self.assertEqual((record.checkout_time, record.auto_closed), (None, False))
+        self.assertEqual(DailyAttendanceSummary.objects.get(employee=self.employee, date=self.day).status,
+                         'incomplete')
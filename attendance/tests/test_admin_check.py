@@ -0,0 +1,57 @@
+from django.contrib.auth.models import Group
+from django.test import override_settings
+
+from attendance.models import Attendance
+from attendance.punches import CHECK_IN
+
+from .base import AttendanceAPITestCase, authenticate
+
+
+class BulkAdminCheckTests(AttendanceAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        authenticate(self.client, self.admin)
+
+    @override_settings(ADMIN_BULK_CHECK_MAX_EMPLOYEES=2)
+    def test_bulk_admin_check_validates_before_querying(self):
+        # Caches the token version, so the requests below only query what the view does
+        self.client.get('/api/is_admin/')
+        for employee_ids in ([1, 2, 3], [1, 1.5], [True]):
+            with self.assertNumQueries(0):
+                response = self.client.post(
+                    '/api/admin/check/', {'action': CHECK_IN, 'employee_ids': employee_ids}, format='json',
+                )
+            self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            '/api/admin/check/', {'action': CHECK_IN, 'employee_ids': [self.employee.id, 0]}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {employee_id: result['status'] for employee_id, result in response.data['results'].items()},
+            {self.employee.id: 'ok', 0: 'error'},
+        )
+
+    def test_group_members_are_checked_in(self):
+        group = Group.objects.create(name='Night')
+        self.employee.groups.add(group)
+        response = self.client.post('/api/admin/check/', {'action': CHECK_IN, 'group': 'Night'}, format='json')
+        self.assertEqual({employee_id: result['status'] for employee_id, result in response.data['results'].items()},
+                         {self.employee.id: 'ok'})
+        self.assertTrue(Attendance.objects.filter(employee=self.employee).exists())
+
+    @override_settings(ADMIN_BULK_CHECK_MAX_EMPLOYEES=1)
+    def test_group_over_the_limit_is_rejected(self):
+        group = Group.objects.create(name='Night')
+        group.user_set.add(self.employee, self.admin)
+        response = self.client.post('/api/admin/check/', {'action': CHECK_IN, 'group': 'Night'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_employees_cannot_check_others_in(self):
+        authenticate(self.client, self.employee)
+        response = self.client.post(
+            '/api/admin/check/', {'action': CHECK_IN, 'employee_ids': [self.employee.id]}, format='json',
+        )
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+from attendance.models import Attendance
+
+from .base import AttendanceAPITestCase, at, authenticate
+
+
+class AnalyticsTests(AttendanceAPITestCase):
+    day = date(2024, 3, 4)
+
+    def setUp(self):
+        super().setUp()
+        authenticate(self.client, self.admin)
+
+    def analytics(self, **params):
+        params = {'start_date': self.day.isoformat(), 'end_date': (self.day + timedelta(days=1)).isoformat(), **params}
+        return self.client.get('/api/admin/analytics/', params)
+
+    def test_hours_lateness_and_overtime_per_employee(self):
+        Attendance.objects.create(employee=self.employee, work_date=self.day,
+                                  checkin_time=at(self.day, 9, 30), checkout_time=at(self.day, 18, 30))
+        Attendance.objects.create(employee=self.employee, work_date=self.day + timedelta(days=1),
+                                  checkin_time=at(self.day + timedelta(days=1), 9))
+
+        response = self.analytics()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['employees'], [{
+            "employee_id": self.employee.id,
+            "employee": "Emma Stone",
+            "days_present": 2,
+            "worked_hours": 9.0,
+            "average_hours": 9.0,
+            "late_days": 1,
+            "late_minutes": 30.0,
+            "missing_checkouts": 1,
+            "overtime_hours": 1.0,
+        }])
+
+    def test_shift_start_override(self):
+        Attendance.objects.create(employee=self.employee, work_date=self.day,
+                                  checkin_time=at(self.day, 9, 30), checkout_time=at(self.day, 17, 30))
+        response = self.analytics(shift_start='10:00')
+        self.assertEqual(response.data['totals']['late_arrivals'], 0)
+        self.assertEqual(response.data['shift_start'], '10:00')
+
+    def test_row_without_checkin_is_left_out_of_the_figures(self):
+        Attendance.objects.create(employee=self.employee, work_date=self.day, checkout_time=at(self.day, 18))
+
+        response = self.analytics()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals'], {
+            "employees": 1, "records": 1, "worked_hours": 0.0, "late_arrivals": 0,
+            "missing_checkouts": 0, "overtime_hours": 0.0,
+        })
+
+    def test_admins_only(self):
+        authenticate(self.client, self.employee)
+        self.assertEqual(self.analytics().status_code, 403)
+
+    def test_invalid_shift_start(self):
+        self.assertEqual(self.analytics(shift_start='9am').status_code, 400)
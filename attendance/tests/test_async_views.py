@@ -0,0 +1,70 @@
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import AsyncRequestFactory, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from attendance.async_views import AsyncCheckinView, AsyncCheckoutView
+from attendance.authentication import issue_tokens
+from attendance.models import Attendance, OfficeLocation, User
+from attendance.reports import report_response
+
+from .base import OFFICE, AttendanceAPITestCase, at
+
+
+class AsyncViewTests(AttendanceAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+        self.view = AsyncCheckinView.as_view()
+
+    async def test_missing_credentials_get_drf_error_body(self):
+        response = await self.view(self.factory.post('/api/checkin/'))
+        self.assertEqual(response.status_code, 401)
+        self.assertJSONEqual(response.content, {"detail": "Authentication credentials were not provided."})
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+
+    async def test_invalid_token_is_rejected_with_a_challenge(self):
+        response = await self.view(self.factory.post('/api/checkin/', headers={'Authorization': 'Bearer bad'}))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content)['code'], 'token_not_valid')
+        self.assertIn('WWW-Authenticate', response)
+
+    @override_settings(ATTENDANCE_ASYNC_VIEWS=True)
+    async def test_reports_stream_asynchronously(self):
+        day = timezone.localdate()
+        await Attendance.objects.acreate(employee=self.employee, work_date=day, checkin_time=at(day, 9))
+        response = report_response(day, day, 'csv')
+
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response])
+        self.assertIn(b'employee', content.lower())
+
+
+class AsyncCheckinTests(TransactionTestCase):
+    # The async check-in relies on autocommit: a rejected INSERT must not break an enclosing transaction
+
+    def setUp(self):
+        OfficeLocation.objects.create(radius=1, **OFFICE)
+        self.employee = User.objects.create_user('employee', password='secret')
+        self.token = str(issue_tokens(self.employee).access_token)
+        caches[settings.IDEMPOTENCY_CACHE].clear()
+
+    async def test_checkin_once_per_day(self):
+        view, factory = AsyncCheckinView.as_view(), AsyncRequestFactory()
+        headers = {'Authorization': f'Bearer {self.token}'}
+        responses = [
+            await view(factory.post('/api/checkin/', OFFICE, content_type='application/json', headers=headers))
+            for _ in range(2)
+        ]
+        self.assertEqual([response.status_code for response in responses], [200, 400])
+        self.assertEqual(await Attendance.objects.filter(employee=self.employee).acount(), 1)
+
+    async def test_checkout_needs_a_checkin(self):
+        view, factory = AsyncCheckoutView.as_view(), AsyncRequestFactory()
+        headers = {'Authorization': f'Bearer {self.token}'}
+        response = await view(factory.post('/api/checkout/', OFFICE, content_type='application/json', headers=headers))
+        self.assertEqual(response.status_code, 400)
+        self.assertJSONEqual(response.content, {"message": "No check-in found!"})
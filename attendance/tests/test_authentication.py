@@ -0,0 +1,56 @@
+from .base import AttendanceAPITestCase, authenticate
+
+
+class TokenRevocationTests(AttendanceAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        authenticate(self.client, self.admin)
+        # Caches the token version, as a previous request would have
+        self.assertEqual(self.client.get('/api/is_admin/').status_code, 200)
+
+    def save_admin(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.save(**kwargs)
+
+    def test_demoted_admin_token_is_revoked(self):
+        self.admin.role = 'employee'
+        self.save_admin()
+        self.assertEqual(self.client.get('/api/is_admin/').status_code, 401)
+
+    def test_removing_superuser_revokes_the_token(self):
+        self.admin.is_superuser = False
+        self.save_admin(update_fields=['is_superuser'])
+        self.assertEqual(self.client.get('/api/is_admin/').status_code, 401)
+
+    def test_deactivation_revokes_the_token(self):
+        self.admin.is_active = False
+        self.save_admin()
+        self.assertEqual(self.client.get('/api/is_admin/').status_code, 401)
+
+    def test_unrelated_changes_keep_the_token(self):
+        version = self.admin.token_version
+        self.admin.first_name = 'Ada'
+        self.save_admin()
+        self.assertEqual(self.admin.token_version, version)
+        self.assertEqual(self.client.get('/api/is_admin/').status_code, 200)
+
+    def test_cached_version_is_dropped_once_the_change_commits(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.admin.role = 'employee'
+            self.admin.save()
+        # A request served before the commit may cache the old version again
+        self.assertEqual(self.client.get('/api/is_admin/').status_code, 200)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get('/api/is_admin/').status_code, 401)
+
+    def test_claims_come_from_the_token(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/is_admin/')
+        self.assertEqual(response.data, {'is_admin': True})
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalid')
+        self.assertEqual(self.client.get('/api/is_admin/').status_code, 401)
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from attendance.models import Attendance
+
+from .base import OFFICE, AttendanceAPITestCase, at
+
+
+class CheckinTests(AttendanceAPITestCase):
+
+    def test_checkin_and_checkout(self):
+        response = self.client.post('/api/checkin/', OFFICE, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post('/api/checkout/', OFFICE, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        record = Attendance.objects.get(employee=self.employee)
+        self.assertEqual(record.work_date, timezone.localdate(record.checkin_time))
+        self.assertIsNotNone(record.checkout_time)
+
+    def test_second_checkin_on_the_same_day_is_rejected(self):
+        self.client.post('/api/checkin/', OFFICE, format='json')
+        response = self.client.post('/api/checkin/', OFFICE, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"message": "Already checked in today!"})
+        self.assertEqual(Attendance.objects.filter(employee=self.employee).count(), 1)
+
+    def test_unique_constraint_rejects_a_second_row_for_the_day(self):
+        Attendance.objects.create(employee=self.employee, checkin_time=timezone.now())
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Attendance.objects.create(employee=self.employee, checkin_time=timezone.now())
+
+
+class WorkDateMigrationTests(TransactionTestCase):
+    migrate_from = [('attendance', '0002_officelocation')]
+    migrate_to = [('attendance', '0003_attendance_work_date')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        self.apps = executor.loader.project_state(self.migrate_from).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+        return executor.loader.project_state(self.migrate_to).apps
+
+    def test_duplicate_rows_are_merged_and_empty_rows_removed(self):
+        user = self.apps.get_model('attendance', 'User').objects.create(username='employee')
+        Attendance = self.apps.get_model('attendance', 'Attendance')
+        day = date(2024, 3, 4)
+        Attendance.objects.create(employee_id=user.pk, checkin_time=at(day, 9), checkout_time=at(day, 12))
+        Attendance.objects.create(employee_id=user.pk, checkin_time=at(day, 13), checkout_time=at(day, 18))
+        Attendance.objects.create(employee_id=user.pk, checkin_time=at(day + timedelta(days=1), 9))
+        Attendance.objects.create(employee_id=user.pk)
+
+        Attendance = self.migrate().get_model('attendance', 'Attendance')
+
+        rows = list(Attendance.objects.order_by('work_date').values_list('work_date', 'checkin_time', 'checkout_time'))
+        self.assertEqual(rows, [
+            (day, at(day, 9), at(day, 18)),
+            (day + timedelta(days=1), at(day + timedelta(days=1), 9), None),
+        ])
@@ -0,0 +1,86 @@
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from attendance.geofence import (
+    OfficeIndex, find_office, haversine, haversine_np, invalidate_office_index, validate_points,
+)
+from attendance.models import Attendance, OfficeLocation
+
+from .base import OFFICE, AttendanceAPITestCase
+
+# About 1.1 km north of OFFICE
+NEARBY = {'latitude': 41.31, 'longitude': 69.24}
+
+
+class GeofenceCheckinTests(AttendanceAPITestCase):
+
+    def test_checkin_records_the_matched_office(self):
+        response = self.client.post('/api/checkin/', OFFICE, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Attendance.objects.get().office, OfficeLocation.objects.get())
+
+    def test_checkin_far_from_every_office_is_rejected(self):
+        response = self.client.post('/api/checkin/', {'latitude': 0, 'longitude': 0}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Attendance.objects.exists())
+
+
+class OfficeIndexTests(TestCase):
+
+    def setUp(self):
+        self.office = OfficeLocation.objects.create(radius=1, **OFFICE)
+        self.refresh_index()
+
+    def refresh_index(self):
+        # Offices created here are never committed, so the index is rebuilt explicitly
+        invalidate_office_index()
+        find_office(**OFFICE)
+
+    def test_point_outside_the_radius_does_not_match(self):
+        self.assertEqual(find_office(**OFFICE).office_id, self.office.id)
+        self.assertIsNone(find_office(**NEARBY))
+
+    def test_nearest_containing_office_wins(self):
+        wide = OfficeLocation.objects.create(radius=5, latitude=41.32, longitude=69.24)
+        self.refresh_index()
+        self.assertEqual(find_office(**NEARBY).office_id, wide.id)
+        # Both contain OFFICE; the one it sits on is nearer
+        self.assertEqual(find_office(**OFFICE).office_id, self.office.id)
+
+    def test_index_is_rebuilt_only_after_the_change_commits(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            nearby = OfficeLocation.objects.create(radius=1, **NEARBY)
+            self.assertIsNone(find_office(**NEARBY))
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        self.assertEqual(find_office(**NEARBY).office_id, nearby.id)
+
+    @override_settings(OFFICE_LATITUDE=10, OFFICE_LONGITUDE=20, OFFICE_RADIUS=1)
+    def test_settings_office_is_used_until_one_is_configured(self):
+        self.office.delete()
+        self.refresh_index()
+        match = find_office(10, 20)
+        self.assertIsNone(match.office_id)
+        self.assertIsNone(find_office(**OFFICE))
+
+
+class BatchValidationTests(SimpleTestCase):
+    latitudes = [41.3, 41.31, 41.2995, 0, -33.87]
+    longitudes = [69.24, 69.24, 69.2405, 0, 151.21]
+
+    def test_vectorized_distance_matches_the_scalar_one(self):
+        expected = [haversine(lat, lon, 41.3, 69.24) for lat, lon in zip(self.latitudes, self.longitudes)]
+        np.testing.assert_allclose(haversine_np(self.latitudes, self.longitudes, 41.3, 69.24), expected)
+
+    def test_points_are_checked_against_every_office(self):
+        distances, inside = validate_points(self.latitudes, self.longitudes, [41.3, 41.31], [69.24, 69.24], [1, 2])
+        self.assertEqual(distances.shape, (5, 2))
+        self.assertEqual(inside.tolist(), [[True, True], [False, True], [True, True], [False, False], [False, False]])
+
+    def test_batch_matches_agree_with_single_matches(self):
+        index = OfficeIndex([1, 2], [41.3, 41.31], [69.24, 69.24], [1, 2])
+        expected = [index.match(lat, lon) for lat, lon in zip(self.latitudes, self.longitudes)]
+        # A chunk size that does not divide the points exercises the last, partial chunk
+        self.assertEqual(index.match_many(self.latitudes, self.longitudes, chunk_size=2), expected)
+        self.assertEqual([match and match.office_id for match in expected], [1, 2, 1, None, None])
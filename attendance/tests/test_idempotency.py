@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.test import RequestFactory
+
+from attendance.idempotency import IN_PROGRESS, idempotency_cache_key
+from attendance.models import Attendance
+
+from .base import OFFICE, AttendanceAPITestCase, authenticate
+
+
+class IdempotencyTests(AttendanceAPITestCase):
+
+    def post(self, key):
+        return self.client.post('/api/checkin/', OFFICE, format='json', headers={'Idempotency-Key': key})
+
+    def test_repeated_key_replays_the_first_response(self):
+        first = self.post('abc')
+        second = self.post('abc')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual((second.status_code, second.data), (200, first.data))
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Attendance.objects.filter(employee=self.employee).count(), 1)
+
+    def test_new_key_runs_the_handler_again(self):
+        self.post('abc')
+        response = self.post('def')
+        self.assertEqual(response.data, {"message": "Already checked in today!"})
+
+    def test_keys_are_scoped_to_the_user(self):
+        self.post('abc')
+        authenticate(self.client, self.admin)
+        response = self.post('abc')
+        self.assertEqual(response.data, {"message": "Check-in successful!"})
+        self.assertNotIn('Idempotent-Replayed', response)
+
+    def test_key_still_in_progress_conflicts(self):
+        request = RequestFactory().post('/api/checkin/', headers={'Idempotency-Key': 'abc'})
+        request.user = self.employee
+        caches[settings.IDEMPOTENCY_CACHE].set(idempotency_cache_key(request), IN_PROGRESS)
+
+        response = self.post('abc')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_overlong_key_is_rejected(self):
+        self.assertEqual(self.post('x' * 256).status_code, 400)
@@ -0,0 +1,87 @@
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from attendance.jobs import artifact_path, enqueue_report, find_artifact, report_data_version
+from attendance.models import Attendance, ReportJob, Shift
+
+from .base import AttendanceAPITestCase, at, authenticate
+
+
+class ReportJobTests(AttendanceAPITestCase):
+    day = date(2024, 3, 4)
+
+    def setUp(self):
+        super().setUp()
+        storage = tempfile.TemporaryDirectory()
+        self.addCleanup(storage.cleanup)
+        self.storage = Path(storage.name)
+        settings_override = override_settings(REPORT_STORAGE_DIR=storage.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        Attendance.objects.create(employee=self.employee, work_date=self.day,
+                                  checkin_time=at(self.day, 9), checkout_time=at(self.day, 17))
+
+    def run_worker(self):
+        output = StringIO()
+        call_command('run_report_worker', '--once', stdout=output)
+        return output.getvalue()
+
+    def test_worker_generates_and_reuses_the_report(self):
+        job = enqueue_report(self.day, self.day, 'csv')
+        self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(find_artifact(self.day, self.day, 'csv'), Path(job.file_path))
+        self.assertEqual(enqueue_report(self.day, self.day, 'csv'), job)
+
+    def test_version_changes_with_the_rows(self):
+        version = report_data_version(self.day, self.day)
+        record = Attendance.objects.get(employee=self.employee)
+        record.checkout_time = at(self.day, 18)
+        record.save()
+        self.assertNotEqual(report_data_version(self.day, self.day), version)
+
+    def test_version_changes_once_a_user_rename_commits(self):
+        version = report_data_version(self.day, self.day)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.last_name = 'Hill'
+            self.employee.save()
+        self.assertNotEqual(report_data_version(self.day, self.day), version)
+
+    def test_version_changes_with_the_shifts(self):
+        shift = Shift.objects.create(name='Night', start_time='22:00', duration=timedelta(hours=8))
+        version = report_data_version(self.day, self.day)
+        shift.name = 'Late'
+        shift.save()
+        self.assertNotEqual(report_data_version(self.day, self.day), version)
+
+    def test_worker_deletes_superseded_files(self):
+        stale = artifact_path(self.day, self.day, 'csv', 'stale')
+        stale.write_text('old')
+        other_range = artifact_path(self.day, self.day + timedelta(days=1), 'csv', 'stale')
+        other_range.write_text('old')
+        enqueue_report(self.day, self.day, 'csv')
+        self.assertIn('Deleted 1 superseded', self.run_worker())
+        self.assertFalse(stale.exists())
+        self.assertTrue(other_range.exists())
+
+    def test_api_queues_and_downloads(self):
+        authenticate(self.client, self.admin)
+        params = {'start_date': '2024-03-04', 'end_date': '2024-03-04', 'format': 'csv'}
+        response = self.client.post('/api/admin/report/jobs/', params)
+        self.assertEqual(response.status_code, 202)
+        self.run_worker()
+        self.assertEqual(self.client.post('/api/admin/report/jobs/', params).status_code, 200)
+        download = self.client.get(f"/api/admin/report/jobs/{response.data['job_id']}/download/")
+        self.assertEqual(download.status_code, 200)
+        self.assertIn('Stone', b''.join(download.streaming_content).decode())
+
+    def test_employees_cannot_queue_reports(self):
+        response = self.client.post('/api/admin/report/jobs/', {'start_date': '2024-03-04', 'end_date': '2024-03-04'})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ReportJob.objects.exists())
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.test import AsyncRequestFactory
+
+from attendance.async_views import AsyncLoginView
+
+from .base import AttendanceAPITestCase
+
+
+class LoginTests(AttendanceAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.credentials()
+
+    def test_login_returns_tokens(self):
+        response = self.client.post('/api/login/', {'login': 'employee', 'password': 'secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data)
+
+    def test_wrong_password_is_rejected(self):
+        response = self.client.post('/api/login/', {'login': 'employee', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 401)
+
+
+class AsyncLoginTests(AttendanceAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+        self.view = AsyncLoginView.as_view()
+
+    def login(self, password):
+        return self.view(self.factory.post(
+            '/api/login/', {'login': 'employee', 'password': password}, content_type='application/json',
+        ))
+
+    async def test_login_returns_tokens(self):
+        response = await self.login('secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.content.decode())
+
+    async def test_wrong_password_is_rejected(self):
+        response = await self.login('wrong')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_attempts_per_login_are_throttled(self):
+        limit = int(settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['login'].split('/')[0])
+        for _ in range(limit):
+            self.assertEqual((await self.login('wrong')).status_code, 401)
+        response = await self.login('wrong')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
@@ -0,0 +1,38 @@
+from django.test import SimpleTestCase, override_settings
+
+from attendance.metrics import METRICS_CONTENT_TYPE, fingerprint
+
+from .base import AttendanceAPITestCase
+
+
+class MetricsTests(AttendanceAPITestCase):
+
+    def test_requests_are_recorded_per_view(self):
+        self.client.get('/api/is_admin/')
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], METRICS_CONTENT_TYPE)
+        content = response.content.decode()
+        for name in ('attendance_request_duration_seconds', 'attendance_db_queries', 'attendance_db_duration_seconds',
+                     'attendance_response_size_bytes', 'attendance_memory_delta_bytes'):
+            self.assertIn(f'{name}_count{{method="GET",view="is_admin"}}', content)
+
+    def test_other_addresses_are_refused(self):
+        response = self.client.get('/api/metrics/', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_requests_log_their_query_shapes(self):
+        with self.assertLogs('attendance.middleware', 'WARNING') as logs:
+            self.client.get('/api/users/', {'search': 'stone'})
+        self.assertIn('Slow request GET /api/users/', logs.output[0])
+        self.assertIn('1x SELECT', logs.output[0])
+
+
+class FingerprintTests(SimpleTestCase):
+
+    def test_literals_and_in_lists_are_replaced(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE name = 'O''Brien' AND id IN (1, 2, 3)\n  AND age > 30.5"),
+            "SELECT * FROM t WHERE name = ? AND id IN (...) AND age > ?",
+        )
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from attendance import partitioning
+from attendance.models import DailyAttendanceSummary, RetentionCutoff, User
+from attendance.summaries import rebuild_summaries
+
+from .base import EVERY_DAY, at
+
+
+def partition_attendance(*args):
+    output = StringIO()
+    call_command('partition_attendance', *args, stdout=output)
+    return output.getvalue()
+
+
+@override_settings(ATTENDANCE_WORKDAYS=EVERY_DAY)
+class RetentionCutoffTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user('employee', password='secret')
+        cls.today = timezone.localdate()
+        User.objects.filter(pk=cls.employee.pk).update(date_joined=at(cls.today - timedelta(days=10), 12))
+        cls.day = cls.today - timedelta(days=7)
+        DailyAttendanceSummary.objects.create(employee=cls.employee, date=cls.day, status='present')
+        RetentionCutoff.objects.create(cutoff=cls.day + timedelta(days=1))
+
+    def test_rebuild_keeps_summaries_before_the_cutoff(self):
+        rebuild_summaries(self.today - timedelta(days=9), self.today - timedelta(days=1))
+
+        self.assertEqual(DailyAttendanceSummary.objects.get(date=self.day).status, 'present')
+        self.assertFalse(DailyAttendanceSummary.objects.filter(date__lt=self.day).exists())
+        self.assertTrue(DailyAttendanceSummary.objects.filter(date__gt=self.day, status='absent').exists())
+
+    def test_command_refuses_ranges_before_the_cutoff(self):
+        with self.assertRaisesMessage(CommandError, "dropped by the retention policy"):
+            call_command('rebuild_attendance_summary', start=self.day - timedelta(days=2), end=self.day,
+                         stdout=StringIO(), stderr=StringIO())
+
+
+class PartitionMaintenanceTests(TestCase):
+
+    @skipUnless(connection.vendor != 'postgresql', "Checks the fallback on other databases")
+    def test_other_databases_are_left_alone(self):
+        self.assertIn("needs PostgreSQL", partition_attendance())
+
+    @skipUnless(connection.vendor == 'postgresql', "Partitioning needs PostgreSQL")
+    def test_plain_table_is_not_maintained(self):
+        with connection.cursor() as cursor:
+            if partitioning.is_partitioned(cursor):
+                self.skipTest("The test database was created partitioned")
+            tables = set(connection.introspection.table_names(cursor))
+
+        self.assertIsNone(partitioning.maintain_partitions())
+        self.assertIn("not partitioned", partition_attendance())
+        with connection.cursor() as cursor:
+            self.assertEqual(set(connection.introspection.table_names(cursor)), tables)
+
+    @skipUnless(connection.vendor == 'postgresql', "Partitioning needs PostgreSQL")
+    def test_converted_table_gets_upcoming_months(self):
+        output = partition_attendance('--convert')
+
+        self.assertIn("Attendance partitions are up to date.", output)
+        next_month = partitioning.add_months(timezone.localdate().replace(day=1), 1)
+        with connection.cursor() as cursor:
+            self.assertTrue(partitioning.is_partitioned(cursor))
+            self.assertIn(
+                partitioning.MONTH_PARTITION.format(next_month.year, next_month.month),
+                partitioning.partitions(cursor),
+            )
@@ -0,0 +1,75 @@
+from django.test import override_settings
+from django.utils import timezone
+
+from attendance.presence import parse_event_id
+
+from .base import OFFICE, AttendanceAPITestCase, authenticate
+
+
+class PresenceTests(AttendanceAPITestCase):
+
+    def check_in(self):
+        authenticate(self.client, self.employee)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/checkin/', OFFICE, format='json')
+        authenticate(self.client, self.admin)
+
+    def test_board_counts_todays_attendance(self):
+        self.check_in()
+        response = self.client.get('/api/presence/')
+        self.assertEqual(response.data['counts'], {'absent': 0, 'checked_in': 1, 'checked_out': 0})
+        self.assertEqual(
+            [(entry['employee'], entry['status']) for entry in response.data['employees']],
+            [('Emma Stone', 'checked_in')],
+        )
+
+    def test_board_applies_published_changes_without_rebuilding(self):
+        authenticate(self.client, self.admin)
+        self.assertEqual(self.client.get('/api/presence/').data['counts']['absent'], 1)
+        self.check_in()
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/presence/')
+        self.assertEqual((response.data['sequence'], response.data['counts']['checked_in']), (1, 1))
+
+    def test_employees_cannot_see_the_board(self):
+        self.assertEqual(self.client.get('/api/presence/').status_code, 403)
+        self.assertEqual(self.client.get('/api/presence/stream/').status_code, 403)
+
+
+@override_settings(PRESENCE_POLL_INTERVAL=0)
+class PresenceStreamTests(AttendanceAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        authenticate(self.client, self.admin)
+        self.today = timezone.localdate().isoformat()
+
+    def read(self, count, **headers):
+        response = self.client.get('/api/presence/stream/', headers=headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = iter(response.streaming_content)
+        try:
+            return [next(chunks).decode() for _ in range(count)]
+        finally:
+            response.close()
+
+    def test_stream_starts_with_a_snapshot(self):
+        retry, snapshot = self.read(2)
+        self.assertEqual(retry, 'retry: 2000\n\n')
+        self.assertTrue(snapshot.startswith(f'id: {self.today}:0\nevent: snapshot\n'))
+
+    def test_reconnecting_client_gets_only_the_changes(self):
+        self.client.get('/api/presence/')
+        authenticate(self.client, self.employee)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/checkin/', OFFICE, format='json')
+        authenticate(self.client, self.admin)
+
+        _, change = self.read(2, **{'Last-Event-ID': f'{self.today}:0'})
+        self.assertTrue(change.startswith(f'id: {self.today}:1\nevent: change\n'))
+        self.assertIn('"status": "checked_in"', change)
+
+    def test_malformed_event_ids_start_over(self):
+        self.assertEqual(parse_event_id('2024-03-04:7'), ('2024-03-04', 7))
+        self.assertEqual(parse_event_id('garbage'), (None, 0))
+        self.assertEqual(parse_event_id(None), (None, 0))
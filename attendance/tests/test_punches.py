@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from attendance.models import Attendance
+from attendance.punches import CHECK_IN, CHECK_OUT, Punch, apply_punches
+
+from .base import OFFICE, AttendanceAPITestCase, at, authenticate
+
+
+class ApplyPunchesTests(AttendanceAPITestCase):
+    day = date(2024, 3, 4)
+
+    def test_checkin_and_checkout_in_one_batch(self):
+        results = apply_punches([
+            Punch(0, self.employee.id, CHECK_OUT, at(self.day, 17), None),
+            Punch(1, self.employee.id, CHECK_IN, at(self.day, 9), None),
+        ])
+
+        self.assertEqual({index: result.status for index, result in results.items()}, {0: 'ok', 1: 'ok'})
+        record = Attendance.objects.get(employee=self.employee)
+        self.assertEqual((record.work_date, record.checkin_time, record.checkout_time),
+                         (self.day, at(self.day, 9), at(self.day, 17)))
+
+    def test_replayed_punches_are_duplicates(self):
+        punches = [Punch(0, self.employee.id, CHECK_IN, at(self.day, 9), None),
+                   Punch(1, self.employee.id, CHECK_OUT, at(self.day, 17), None)]
+        apply_punches(punches)
+        results = apply_punches(punches)
+        self.assertEqual([results[0].status, results[1].status], ['duplicate', 'duplicate'])
+
+    def test_invalid_punches_are_reported(self):
+        next_day = self.day + timedelta(days=1)
+        results = apply_punches([
+            Punch(0, self.employee.id, CHECK_OUT, at(self.day, 17), None),
+            Punch(1, self.employee.id, CHECK_IN, at(next_day, 9), None),
+            Punch(2, self.employee.id, CHECK_IN, at(next_day, 10), None),
+        ])
+        results.update(apply_punches([Punch(3, self.employee.id, CHECK_OUT, at(next_day, 8), None)]))
+
+        self.assertEqual([results[index].message for index in range(4)], [
+            "No check-in found!", "Check-in successful!", "Already checked in today!",
+            "Check-out is earlier than check-in.",
+        ])
+
+    def test_bulk_punches_are_limited_in_age_for_employees(self):
+        now = timezone.now()
+        events = [
+            {'action': CHECK_IN, 'timestamp': now - settings.BULK_PUNCH_MAX_AGE - timedelta(days=1), **OFFICE},
+            {'action': CHECK_IN, 'timestamp': now + settings.BULK_PUNCH_CLOCK_SKEW + timedelta(hours=1), **OFFICE},
+            {'action': CHECK_IN, 'timestamp': now - timedelta(hours=1), **OFFICE},
+        ]
+        response = self.client.post('/api/attendance/bulk/', {'events': events}, format='json')
+        self.assertEqual([result['status'] for result in response.data['results']], ['error', 'error', 'ok'])
+
+        authenticate(self.client, self.admin)
+        response = self.client.post(
+            '/api/attendance/bulk/', {'events': [dict(events[0], employee_id=self.employee.id)]}, format='json',
+        )
+        self.assertEqual(response.data['results'][0]['status'], 'ok')
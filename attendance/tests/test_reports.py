@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from io import BytesIO
+
+from attendance.excel import HEADER_STYLE, TIME_FORMAT, TIME_STYLE
+from attendance.models import Attendance
+from attendance.reports import COLUMN_WIDTH, EXPORT_COLUMNS, REPORT_COLUMNS, write_excel_report
+
+from .base import AttendanceAPITestCase, at, authenticate
+
+
+class ReportTests(AttendanceAPITestCase):
+    day = date(2024, 3, 4)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Attendance.objects.create(employee=cls.employee, work_date=cls.day,
+                                  checkin_time=at(cls.day, 9), checkout_time=at(cls.day, 17, 30))
+
+    def setUp(self):
+        super().setUp()
+        authenticate(self.client, self.admin)
+
+    def report(self, report_format, end_date=None):
+        response = self.client.get('/api/admin/report/', {
+            'start_date': str(self.day), 'end_date': str(end_date or self.day + timedelta(days=1)),
+            'format': report_format,
+        })
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_excel_report_has_a_sheet_per_day(self):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(BytesIO(self.report('xlsx')))
+        self.assertEqual(workbook.sheetnames, ['2024-03-04', '2024-03-05'])
+        rows = list(workbook['2024-03-04'].values)
+        self.assertEqual(rows[0], tuple(REPORT_COLUMNS))
+        self.assertEqual(rows[1], ('Emma Stone', None, at(self.day, 9).replace(tzinfo=None),
+                                   at(self.day, 17, 30).replace(tzinfo=None)))
+        self.assertEqual(list(workbook['2024-03-05'].values), [tuple(REPORT_COLUMNS)])
+
+    def test_excel_cells_share_named_styles(self):
+        from openpyxl import load_workbook
+
+        worksheet = load_workbook(BytesIO(self.report('xlsx', self.day)))['2024-03-04']
+        header, row = worksheet[1], worksheet[2]
+        self.assertEqual({cell.style for cell in header}, {HEADER_STYLE})
+        self.assertTrue(header[0].font.bold)
+        self.assertEqual([(cell.style, cell.number_format) for cell in row[2:]], [(TIME_STYLE, TIME_FORMAT)] * 2)
+        self.assertEqual(worksheet.column_dimensions['D'].width, COLUMN_WIDTH)
+
+    def test_excel_report_reads_the_range_with_one_query(self):
+        with self.assertNumQueries(1):
+            write_excel_report(self.day, self.day + timedelta(days=30), BytesIO())
+
+    def test_csv_report_has_a_row_per_record(self):
+        lines = self.report('csv').decode().splitlines()
+        self.assertEqual(lines, [
+            ','.join(EXPORT_COLUMNS),
+            '2024-03-04,Emma Stone,,2024-03-04 09:00:00,2024-03-04 17:30:00',
+        ])
+
+    def test_parquet_report_keeps_typed_columns(self):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(BytesIO(self.report('parquet')))
+        self.assertEqual(table.column_names, ['date', 'employee', 'shift', 'checkin_time', 'checkout_time'])
+        self.assertEqual(table.to_pylist(), [{
+            'date': self.day, 'employee': 'Emma Stone', 'shift': None,
+            'checkin_time': at(self.day, 9), 'checkout_time': at(self.day, 17, 30),
+        }])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get('/api/admin/report/', {
+            'start_date': '2024-03-04', 'end_date': '2024-03-04', 'format': 'pdf',
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_ranges_are_rejected(self):
+        for params in ({'start_date': '2024-03-04'}, {'start_date': '2024-03-05', 'end_date': '2024-03-04'},
+                       {'start_date': '04.03.2024', 'end_date': '2024-03-04'}):
+            self.assertEqual(self.client.get('/api/admin/report/', params).status_code, 400)
+
+    def test_employees_cannot_download_reports(self):
+        authenticate(self.client, self.employee)
+        response = self.client.get('/api/admin/report/', {'start_date': '2024-03-04', 'end_date': '2024-03-04'})
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,66 @@
+from datetime import date, time, timedelta
+
+from django.test import override_settings
+
+from attendance.models import Attendance, ExpectedPresence, Notification, Schedule, Shift, User
+from attendance.scheduler import next_run, run_checks
+
+from .base import EVERY_DAY, AttendanceAPITestCase, at, authenticate
+
+
+@override_settings(ATTENDANCE_WORKDAYS=EVERY_DAY)
+class SchedulerTests(AttendanceAPITestCase):
+    day = date(2024, 3, 4)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        yesterday = cls.day - timedelta(days=1)
+        cls.working = User.objects.create_user('working', password='secret')
+        Attendance.objects.create(employee=cls.working, work_date=cls.day, checkin_time=at(cls.day, 9))
+        cls.forgetful = User.objects.create_user('forgetful', password='secret')
+        Attendance.objects.create(employee=cls.forgetful, work_date=yesterday, checkin_time=at(yesterday, 9))
+        cls.early = User.objects.create_user('early', password='secret')
+        shift = Shift.objects.create(name='Early', start_time=time(6), duration=timedelta(hours=8))
+        Schedule.objects.create(employee=cls.early, shift=shift, valid_from=cls.day)
+        ExpectedPresence.objects.create(employee=cls.early, shift=shift, work_date=cls.day,
+                                        start=at(cls.day, 6), end=at(cls.day, 14))
+
+    def findings(self, kind):
+        return set(Notification.objects.filter(kind=kind).values_list('employee_id', 'date'))
+
+    def test_findings_are_reported_once(self):
+        counts = run_checks(at(self.day, 19))
+
+        self.assertEqual(counts, {'auto_closed': 1, 'absent': 3, 'missing_checkout': 1})
+        self.assertEqual(self.findings('absent'),
+                         {(self.employee.id, self.day), (self.forgetful.id, self.day), (self.early.id, self.day)})
+        self.assertEqual(self.findings('missing_checkout'), {(self.working.id, self.day)})
+        self.assertEqual(self.findings('auto_closed'), {(self.forgetful.id, self.day - timedelta(days=1))})
+        record = Attendance.objects.get(employee=self.forgetful)
+        self.assertEqual((record.checkout_time, record.auto_closed), (at(self.day - timedelta(days=1), 17), True))
+
+        self.assertEqual(run_checks(at(self.day, 20))['auto_closed'], 0)
+        self.assertEqual(Notification.objects.count(), 5)
+
+    def test_absences_wait_for_the_shift_start(self):
+        self.assertEqual(run_checks(at(self.day, 6))['absent'], 0)
+        self.assertEqual(run_checks(at(self.day, 6, 10))['absent'], 1)
+
+    def test_employees_read_only_their_notifications(self):
+        run_checks(at(self.day, 19))
+        response = self.client.get('/api/notifications/')
+        self.assertEqual([(item['kind'], item['employee_id']) for item in response.data['notifications']],
+                         [('absent', self.employee.id)])
+        after = self.client.get('/api/notifications/', {'after': response.data['last_id']})
+        self.assertEqual((after.data['notifications'], after.data['last_id']), ([], response.data['last_id']))
+
+        authenticate(self.client, self.admin)
+        response = self.client.get('/api/notifications/', {'limit': 2})
+        self.assertEqual(len(response.data['notifications']), 2)
+
+    def test_next_run_is_the_next_scheduled_time(self):
+        times = (time(10), time(20))
+        self.assertEqual(next_run(at(self.day, 9), times), at(self.day, 10))
+        self.assertEqual(next_run(at(self.day, 10), times), at(self.day, 20))
+        self.assertEqual(next_run(at(self.day, 21), times), at(self.day + timedelta(days=1), 10))
@@ -0,0 +1,55 @@
+from datetime import date, time, timedelta
+
+from attendance.models import Attendance, ExpectedPresence, Schedule, Shift
+from attendance.punches import CHECK_IN, CHECK_OUT, Punch, apply_punches
+from attendance.schedules import build_calendar, punch_work_dates
+
+from .base import AttendanceAPITestCase, at
+
+
+class NightShiftTests(AttendanceAPITestCase):
+    day = date(2024, 3, 4)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.night = Shift.objects.create(name='Night', start_time=time(22), duration=timedelta(hours=8))
+        Schedule.objects.create(employee=cls.employee, shift=cls.night, weekdays='0123456',
+                                valid_from=cls.day)
+
+    def setUp(self):
+        super().setUp()
+        build_calendar(self.day, self.day + timedelta(days=1))
+
+    def test_calendar_instances_end_after_midnight(self):
+        instance = ExpectedPresence.objects.get(employee=self.employee, work_date=self.day)
+        self.assertEqual((instance.start, instance.end), (at(self.day, 22), at(self.day + timedelta(days=1), 6)))
+
+    def test_latest_schedule_wins(self):
+        early = Shift.objects.create(name='Early', start_time=time(6), duration=timedelta(hours=8))
+        Schedule.objects.create(employee=self.employee, shift=early, valid_from=self.day + timedelta(days=1))
+        build_calendar(self.day, self.day + timedelta(days=1))
+        instances = ExpectedPresence.objects.filter(work_date__lte=self.day + timedelta(days=1))
+        self.assertEqual(list(instances.order_by('work_date').values_list('shift__name', flat=True)),
+                         ['Night', 'Early'])
+
+    def test_checkout_after_midnight_belongs_to_the_shift_start(self):
+        next_day = self.day + timedelta(days=1)
+        self.assertEqual(ExpectedPresence.work_date_for(self.employee.id, at(next_day, 5, 30)), self.day)
+        record = Attendance.objects.create(employee=self.employee, checkin_time=at(self.day, 21, 55))
+        self.assertEqual(record.work_date, self.day)
+
+    def test_punches_match_like_single_lookups(self):
+        next_day = self.day + timedelta(days=1)
+        punches = [Punch(0, self.employee.id, CHECK_IN, at(self.day, 22), None),
+                   Punch(1, self.employee.id, CHECK_OUT, at(next_day, 6, 10), None),
+                   Punch(2, self.admin.id, CHECK_IN, at(next_day, 1), None)]
+        self.assertEqual(punch_work_dates(punches), {0: self.day, 1: self.day, 2: next_day})
+
+        apply_punches(punches[:2])
+        record = Attendance.objects.get(employee=self.employee)
+        self.assertEqual((record.work_date, record.checkout_time), (self.day, at(next_day, 6, 10)))
+
+    def test_punches_without_a_shift_use_the_local_day(self):
+        far = self.day + timedelta(days=10)
+        self.assertEqual(ExpectedPresence.work_date_for(self.employee.id, at(far, 9)), far)
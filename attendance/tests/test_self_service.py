@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from attendance.models import Attendance, User
+from attendance.scheduler import run_checks
+from attendance.summaries import monthly_summary
+
+from .base import EVERY_DAY, AttendanceAPITestCase, at
+
+
+class MyAttendanceTests(AttendanceAPITestCase):
+    day = date(2024, 3, 4)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for offset in range(3):
+            day = cls.day + timedelta(days=offset)
+            Attendance.objects.create(employee=cls.employee, work_date=day,
+                                      checkin_time=at(day, 9), checkout_time=at(day, 17, 30))
+        Attendance.objects.create(employee=cls.admin, work_date=cls.day, checkin_time=at(cls.day, 9))
+        # Kept by the work_date migration without a check-in
+        Attendance.objects.create(employee=cls.employee, work_date=cls.day - timedelta(days=1),
+                                  checkout_time=at(cls.day - timedelta(days=1), 17))
+
+    def test_history_is_paged_newest_first(self):
+        first = self.client.get('/api/me/attendance/', {'page_size': 2})
+        self.assertEqual([record['work_date'] for record in first.data['results']],
+                         [self.day + timedelta(days=2), self.day + timedelta(days=1)])
+        second = self.client.get(first.data['next'])
+        self.assertEqual([record['work_date'] for record in second.data['results']], [self.day])
+        self.assertIsNone(second.data['next'])
+
+    def test_month_totals(self):
+        response = self.client.get('/api/me/summary/', {'month': '2024-03'})
+        self.assertEqual(response.data['month'], '2024-03')
+        self.assertEqual((response.data['present_days'], response.data['late_days']), (3, 0))
+        self.assertEqual((response.data['worked_hours'], response.data['overtime_hours']), (25.5, 1.5))
+        self.assertEqual(response.data['average_hours'], 8.5)
+
+    def test_invalid_month_is_rejected(self):
+        self.assertEqual(self.client.get('/api/me/summary/', {'month': '03/2024'}).status_code, 400)
+
+
+@override_settings(ATTENDANCE_WORKDAYS=EVERY_DAY)
+class MonthlyAbsenceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user('employee', password='secret')
+        cls.today = timezone.localdate()
+        User.objects.filter(pk=cls.employee.pk).update(date_joined=at(cls.today - timedelta(days=10), 12))
+
+    def test_scheduler_absences_count_in_the_monthly_summary(self):
+        now = at(self.today, settings.ATTENDANCE_SHIFT_START.hour + 3)
+        self.assertEqual(run_checks(now)['absent'], 1)
+        totals = monthly_summary(self.employee.id, self.today.replace(day=1))
+        self.assertEqual(totals['absent_days'], 1)
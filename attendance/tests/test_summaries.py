@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from attendance.models import Attendance, DailyAttendanceSummary, InactivePeriod, User
+from attendance.summaries import rebuild_summaries
+
+from .base import EVERY_DAY, at
+
+
+@override_settings(ATTENDANCE_WORKDAYS=EVERY_DAY)
+class SummaryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = User.objects.create_user('employee', password='secret')
+        cls.today = timezone.localdate()
+        User.objects.filter(pk=cls.employee.pk).update(date_joined=at(cls.today - timedelta(days=10), 12))
+
+    def summary(self, day):
+        return DailyAttendanceSummary.objects.get(employee=self.employee, date=day)
+
+    def test_saving_attendance_upserts_its_summary(self):
+        day = self.today - timedelta(days=1)
+        record = Attendance.objects.create(employee=self.employee, work_date=day, checkin_time=at(day, 10))
+        self.assertEqual((self.summary(day).status, self.summary(day).is_late), ('incomplete', True))
+
+        record.checkout_time = at(day, 18)
+        record.save()
+        summary = self.summary(day)
+        self.assertEqual((summary.status, summary.worked_seconds), ('present', 8 * 3600))
+
+        record.delete()
+        self.assertEqual(self.summary(day).status, 'absent')
+
+    def test_rebuild_skips_days_before_joining_and_while_deactivated(self):
+        InactivePeriod.objects.create(
+            employee=self.employee, start=self.today - timedelta(days=5), end=self.today - timedelta(days=3),
+        )
+        day = self.today - timedelta(days=8)
+        Attendance.objects.create(employee=self.employee, work_date=day, checkin_time=at(day, 9),
+                                  checkout_time=at(day, 17))
+
+        rebuild_summaries(self.today - timedelta(days=20), self.today - timedelta(days=1))
+
+        absent = set(DailyAttendanceSummary.objects.filter(status='absent').values_list('date', flat=True))
+        expected = {self.today - timedelta(days=offset) for offset in (10, 9, 7, 6, 3, 2, 1)}
+        self.assertEqual(absent, expected)
+        self.assertEqual(self.summary(day).status, 'present')
+
+    def test_deactivation_opens_and_reactivation_closes_a_period(self):
+        self.employee.is_active = False
+        self.employee.save()
+        self.employee.is_active = True
+        self.employee.save()
+        self.assertEqual(
+            list(InactivePeriod.objects.values_list('start', 'end')), [(self.today, self.today)],
+        )
+
+    def test_rebuild_command_checks_the_range(self):
+        with self.assertRaises(CommandError):
+            call_command('rebuild_attendance_summary', '--start', str(self.today),
+                         '--end', str(self.today - timedelta(days=1)))
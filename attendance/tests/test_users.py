@@ -0,0 +1,50 @@
+from attendance.models import User
+
+from .base import AttendanceAPITestCase
+
+
+class UserListTests(AttendanceAPITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = User.objects.create_user('other', password='secret', first_name='Omar', last_name='Stone')
+
+    def test_fields_projection(self):
+        response = self.client.get('/api/users/', {'fields': 'first_name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0], {'id': self.employee.id, 'first_name': 'Emma'})
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/api/users/', {'fields': 'first_name,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_and_role_filters(self):
+        response = self.client.get('/api/users/', {'search': 'stone', 'role': 'employee', 'fields': 'last_name'})
+        self.assertEqual([user['id'] for user in response.data], [self.employee.id, self.other.id])
+
+    def test_cursor_pages(self):
+        first = self.client.get('/api/users/', {'page_size': 2, 'fields': 'first_name'})
+        self.assertEqual(len(first.data['results']), 2)
+        second = self.client.get(first.data['next'])
+        self.assertEqual([user['first_name'] for user in second.data['results']], ['Omar'])
+        self.assertIsNone(second.data['next'])
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.client.get('/api/users/')['ETag']
+        response = self.client.get('/api/users/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_changes_once_a_user_change_commits(self):
+        etag = self.client.get('/api/users/')['ETag']
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.employee.first_name = 'Emily'
+            self.employee.save()
+        # Before the commit the list may still be read, and cached, as it was
+        self.assertEqual(self.client.get('/api/users/', headers={'If-None-Match': etag}).status_code, 304)
+
+        for callback in callbacks:
+            callback()
+        response = self.client.get('/api/users/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['first_name'], 'Emily')
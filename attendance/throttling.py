@@ -0,0 +1,15 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    """Limits login attempts per login name, whichever address they come from."""
+    scope = 'login'
+
+    def get_cache_key(self, request, view):
+        login = request.data.get('login')
+        if not isinstance(login, str) or not login:
+            return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+        ident = hashlib.md5(login.strip().lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
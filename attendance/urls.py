@@ -1,11 +1,24 @@
+from django.conf import settings
 from django.urls import path
+from .async_views import AsyncAdminCheckInOutView, AsyncCheckinView, AsyncCheckoutView, AsyncLoginView
 from .views import CheckinView, CheckoutView, AdminReportView, LoginView, IsAdminView, PasswordChangeView, UserListView, \
-    AdminCheckInOutView
+    AdminCheckInOutView, BulkPunchView, MetricsView, ReportJobCreateView, ReportJobDetailView, ReportJobDownloadView, \
+    AnalyticsView, PresenceView, PresenceStreamView, MyAttendanceView, MySummaryView, \
+    NotificationListView
+
+if settings.ATTENDANCE_ASYNC_VIEWS:
+    # Served by an ASGI worker, the check-in hot path stays on the event loop
+    CheckinView, CheckoutView, AdminCheckInOutView = AsyncCheckinView, AsyncCheckoutView, AsyncAdminCheckInOutView
+    LoginView = AsyncLoginView
 
 urlpatterns = [
     path('checkin/', CheckinView.as_view(), name='checkin'),
     path('checkout/', CheckoutView.as_view(), name='checkout'),
     path('admin/report/', AdminReportView.as_view(), name='admin-report'),
+    path('admin/report/jobs/', ReportJobCreateView.as_view(), name='report-job-create'),
+    path('admin/report/jobs/<int:job_id>/', ReportJobDetailView.as_view(), name='report-job-detail'),
+    path('admin/report/jobs/<int:job_id>/download/', ReportJobDownloadView.as_view(), name='report-job-download'),
+    path('admin/analytics/', AnalyticsView.as_view(), name='admin-analytics'),
     path('login/', LoginView.as_view(), name='login'),
     path('is_admin/', IsAdminView.as_view(), name='is_admin'),
 
@@ -13,6 +26,18 @@ urlpatterns = [
 
     path('users/', UserListView.as_view(), name='user-list'),
 
+    path('me/attendance/', MyAttendanceView.as_view(), name='my-attendance'),
+    path('me/summary/', MySummaryView.as_view(), name='my-summary'),
+
+    path('notifications/', NotificationListView.as_view(), name='notifications'),  # Scheduler findings
+
     path('admin/check/', AdminCheckInOutView.as_view(), name='admin-checkinout'),  # Admin check-in/out
 
+    path('attendance/bulk/', BulkPunchView.as_view(), name='attendance-bulk'),  # Queued offline punches
+
+    path('presence/', PresenceView.as_view(), name='presence'),
+    path('presence/stream/', PresenceStreamView.as_view(), name='presence-stream'),
+
+    path('metrics/', MetricsView.as_view(), name='metrics'),  # Prometheus scrape endpoint
+
 ]
@@ -0,0 +1,31 @@
+import time
+
+from django.core.cache import cache
+
+# Bumped whenever any user is saved or deleted
+USERS_VERSION_KEY = 'users:version'
+
+
+def get_version(key):
+    """
+    Returns the current version stamp stored under ``key``. Stamps are
+    nanosecond timestamps, so they double as a last-modified time.
+    """
+    version = cache.get(key)
+    if version is None:
+        version = bump_version(key)
+    return version
+
+
+async def aget_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        version = time.time_ns()
+        await cache.aset(key, version, timeout=None)
+    return version
+
+
+def bump_version(key):
+    version = time.time_ns()
+    cache.set(key, version, timeout=None)
+    return version
@@ -1,97 +1,107 @@
-import io
-from math import radians, cos, sin, asin, sqrt
+import hashlib
+from datetime import datetime, timezone as dt_timezone
 
-import pandas as pd
 from django.conf import settings
 from django.contrib.auth import authenticate
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.utils import timezone
-from openpyxl.utils import get_column_letter
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import Attendance, User
-from .serializers import PasswordChangeSerializer, UserSerializer
-
-
-def haversine(lat1, lon1, lat2, lon2):
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-
-    # Haversine formula
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * asin(sqrt(a))
-    r = 6371
-    return c * r
+from .analytics import parse_shift_start, timesheet_analytics
+from .authentication import issue_tokens
+from .geofence import find_office, find_offices
+from .idempotency import idempotent
+from .jobs import enqueue_report, find_artifact
+from .metrics import METRICS_CONTENT_TYPE, render_metrics
+from .models import Attendance, ExpectedPresence, Notification, ReportJob, User
+from .presence import apresence_stream, board, presence_stream
+from .pagination import AttendanceCursorPagination, UserCursorPagination
+from .punches import CHECK_IN, CHECK_OUT, Punch, PunchResult, apply_punches
+from .reports import REPORT_FORMATS, artifact_response, report_response
+from .serializers import PasswordChangeSerializer, PunchSerializer, UserSerializer
+from .summaries import monthly_summary
+from .throttling import LoginRateThrottle
+from .versioning import USERS_VERSION_KEY, get_version
+
+
+def request_location(request):
+    try:
+        return float(request.data.get('latitude')), float(request.data.get('longitude'))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_report_range(params):
+    """Returns ``(start_date, end_date)`` from the params, or an error response."""
+    start_date_str = params.get('start_date')
+    end_date_str = params.get('end_date')
+    if not (start_date_str and end_date_str):
+        return Response({"message": "Please provide both start_date and end_date."}, status=400)
+    try:
+        start_date = timezone.datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        end_date = timezone.datetime.strptime(end_date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return Response({"message": "Dates must be in YYYY-MM-DD format."}, status=400)
+    if start_date > end_date:
+        return Response({"message": "start_date must not be after end_date."}, status=400)
+    return start_date, end_date
 
 
 class CheckinView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request):
-        latitude = request.data.get('latitude')
-        longitude = request.data.get('longitude')
-        if latitude is None or longitude is None:
+        location = request_location(request)
+        if location is None:
             return Response({"message": "Location is required."}, status=400)
 
-        # Office location
-        office_latitude = settings.OFFICE_LATITUDE
-        office_longitude = settings.OFFICE_LONGITUDE
-        office_radius = 0.5  # in kilometers (e.g., 500 meters)
-
-        # Calculate the distance between the user's location and the office
-        distance = haversine(float(latitude), float(longitude), office_latitude, office_longitude)
-
-        if distance > office_radius:
+        office = find_office(*location)
+        if office is None:
             return Response({"message": "You are too far from the office to check in."}, status=400)
 
-        attendance, created = Attendance.objects.get_or_create(
-            employee=request.user,
-            checkin_time__date=timezone.now().date()
-        )
-        if created:
-            attendance.checkin_time = timezone.now()
-            attendance.save()
-            return Response({"message": "Check-in successful!"})
-        else:
+        # The unique (employee, work_date) constraint rejects a second row for the day,
+        # even when two check-ins race each other
+        try:
+            with transaction.atomic():
+                Attendance.objects.create(
+                    employee_id=request.user.id, checkin_time=timezone.now(), office_id=office.office_id
+                )
+        except IntegrityError:
             return Response({"message": "Already checked in today!"}, status=400)
+        return Response({"message": "Check-in successful!"})
 
 
 class CheckoutView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request):
-        # Retrieve location data from the request
-        latitude = request.data.get('latitude')
-        longitude = request.data.get('longitude')
-
-        if latitude is None or longitude is None:
+        location = request_location(request)
+        if location is None:
             return Response({"message": "Location is required."}, status=400)
 
-        # Office location
-        office_latitude = settings.OFFICE_LATITUDE
-        office_longitude = settings.OFFICE_LONGITUDE
-        office_radius = 0.5  # in kilometers
-
-        # Calculate the distance between the user's location and the office
-        distance = haversine(float(latitude), float(longitude), office_latitude, office_longitude)
-
-        if distance > office_radius:
+        if find_office(*location) is None:
             return Response({"message": "You are too far from the office to check out."}, status=400)
 
-        # Handle the checkout logic
+        # Handle the checkout logic; a night shift's check-out belongs to the day it started
+        now = timezone.now()
         try:
-            attendance = Attendance.objects.filter(
-                employee=request.user,
-                checkin_time__date=timezone.now().date()
-            ).latest('checkin_time')
+            attendance = Attendance.objects.get(
+                employee_id=request.user.id, work_date=ExpectedPresence.work_date_for(request.user.id, now)
+            )
             if attendance.checkout_time:
                 return Response({"message": "Already checked out!"}, status=400)
-            attendance.checkout_time = timezone.now()
+            attendance.checkout_time = now
             attendance.save()
             return Response({"message": "Check-out successful!"})
         except Attendance.DoesNotExist:
@@ -101,76 +111,77 @@ class CheckoutView(APIView):
 class AdminReportView(APIView):
     permission_classes = [IsAuthenticated]
 
+    def perform_content_negotiation(self, request, force=False):
+        # ``?format=`` picks the report file type here, not a DRF renderer
+        return super().perform_content_negotiation(request, force=True)
+
     def get(self, request):
-        print(f"User role: {request.user.role}")
-        print(request)
         if request.user.role != 'admin':
             return Response({"message": "Permission denied."}, status=403)
 
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
+        date_range = parse_report_range(request.query_params)
+        if isinstance(date_range, Response):
+            return date_range
 
-        if start_date_str and end_date_str:
-            start_date = timezone.datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            end_date = timezone.datetime.strptime(end_date_str, "%Y-%m-%d").date()
-        else:
-            return Response({"message": "Please provide both start_date and end_date."}, status=400)
+        report_format = request.query_params.get('format', 'xlsx')
+        if report_format not in REPORT_FORMATS:
+            return Response(
+                {"message": f"format must be one of: {', '.join(REPORT_FORMATS)}."}, status=400
+            )
 
-        response = self.generate_excel_report(start_date, end_date)
+        response = self.generate_report(*date_range, report_format)
         return response
 
-    def generate_excel_report(self, start_date, end_date):
-        records_by_date = {}
-
-        # Collecting records for each day within the range
-        for single_date in pd.date_range(start=start_date, end=end_date):
-            records = Attendance.objects.filter(checkin_time__date=single_date)
-            data = [
-                {
-                    'Employee': record.employee.first_name if record.employee.first_name else '' + " " + record.employee.last_name if record.employee.last_name else '' ,
-                    'Check-in Time': record.checkin_time.astimezone(timezone.get_current_timezone()).strftime(
-                        '%Y-%m-%d %H:%M:%S'),
-                    'Check-out Time': record.checkout_time.astimezone(timezone.get_current_timezone()).strftime(
-                        '%Y-%m-%d %H:%M:%S') if record.checkout_time else None,
-                }
-                for record in records
-            ]
-            records_by_date[single_date.date()] = data
+    def generate_report(self, start_date, end_date, report_format):
+        # Serve a report already generated by the worker while the data is unchanged
+        artifact = find_artifact(start_date, end_date, report_format)
+        if artifact is not None:
+            return artifact_response(artifact, start_date, end_date, report_format)
+        return report_response(start_date, end_date, report_format)
 
-        # Create a new Excel file with multiple sheets
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            for date, data in records_by_date.items():
-                df = pd.DataFrame(data)
-                df.to_excel(writer, sheet_name=str(date), index=False)
 
-                # Adjust column width to fit 40 characters
-                worksheet = writer.sheets[str(date)]
-                for col_num, column in enumerate(df.columns, 1):
-                    max_length = 40  # Set a fixed width to display 40 characters
-                    worksheet.column_dimensions[get_column_letter(col_num)].width = max_length
+class AnalyticsView(APIView):
+    """Timesheet figures per employee for a date range, with optional ``shift_start=HH:MM``."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({"message": "Permission denied."}, status=403)
 
-        output.seek(0)
-        response = HttpResponse(output, content_type='application/vnd.ms-excel')
-        response['Content-Disposition'] = f'attachment; filename="Attendance_Report_{start_date}_to_{end_date}.xlsx"'
+        date_range = parse_report_range(request.query_params)
+        if isinstance(date_range, Response):
+            return date_range
+
+        shift_start = None
+        if 'shift_start' in request.query_params:
+            shift_start = parse_shift_start(request.query_params['shift_start'])
+            if shift_start is None:
+                return Response({"message": "shift_start must be in HH:MM format."}, status=400)
+
+        return Response(timesheet_analytics(*date_range, shift_start=shift_start))
 
-        return response
+
+def login_data(user):
+    refresh = issue_tokens(user)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+        'role': user.role if user.role else "",
+        'first_name': user.first_name if user.first_name else "",
+        'last_name': user.last_name if user.last_name else "",
+    }
 
 
 class LoginView(APIView):
+    throttle_classes = [LoginRateThrottle]
+
     def post(self, request, *args, **kwargs):
         login = request.data.get('login')
         password = request.data.get('password')
+        # Hashes from an older hasher or cost are upgraded here on success
         user = authenticate(username=login, password=password)
         if user is not None:
-            refresh = RefreshToken.for_user(user)
-            return Response({
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-                'role': user.role if user.role else "",
-                'first_name': user.first_name if user.first_name else "",
-                'last_name': user.last_name if user.last_name else "",
-            }, status=status.HTTP_200_OK)
+            return Response(login_data(user), status=status.HTTP_200_OK)
         return Response({'detail': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
 
@@ -186,22 +197,90 @@ class PasswordChangeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
-        serializer = PasswordChangeSerializer(data=request.data, context={'request': request})
+        # Password checks need the full user row, not the token user
+        user = request.user.instance
+        serializer = PasswordChangeSerializer(data=request.data, context={'request': request, 'user': user})
         if serializer.is_valid():
-            serializer.update_password(request.user)
+            serializer.update_password(user)
             return Response({"detail": "Password changed successfully"}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def is_integer_id(value):
+    """Accepts ints and strings of digits, not booleans, floats or other JSON values."""
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or isinstance(value, str) and value.isascii() and value.isdigit()
+
+
+def bulk_admin_check(data):
+    """
+    Checks every employee in ``employee_ids``, or every active member of the
+    auth ``group``, in or out at once. The request size is checked before
+    the users are resolved with one query, and the attendance is written
+    by :func:`apply_punches` in one transaction. Returns
+    ``(payload, status)`` with a result per employee.
+    """
+    action = data.get('action')
+    if action not in [CHECK_IN, CHECK_OUT]:
+        return {"message": "A valid action (check_in/check_out) is required."}, 400
+
+    limit = settings.ADMIN_BULK_CHECK_MAX_EMPLOYEES
+    too_many = {"message": f"At most {limit} employees are accepted per request."}, 400
+    if data.get('group'):
+        # One past the limit is enough to tell the group is too large
+        employee_ids = list(
+            User.objects.filter(groups__name=data['group'], is_active=True)
+            .order_by('id').values_list('id', flat=True)[:limit + 1]
+        )
+        if len(employee_ids) > limit:
+            return too_many
+        employees = set(employee_ids)
+    else:
+        # Form posts repeat the field, JSON bodies send a list
+        employee_ids = data.getlist('employee_ids') if hasattr(data, 'getlist') else data.get('employee_ids')
+        if not isinstance(employee_ids, list) or not employee_ids:
+            return {"message": "A non-empty list of employee_ids or a group is required."}, 400
+        if len(employee_ids) > limit:
+            return too_many
+        if not all(is_integer_id(employee_id) for employee_id in employee_ids):
+            return {"message": "employee_ids must be integers."}, 400
+        employee_ids = list(dict.fromkeys(int(employee_id) for employee_id in employee_ids))
+        employees = set(User.objects.filter(pk__in=employee_ids).values_list('id', flat=True))
+
+    now = timezone.now()
+    punches = [
+        Punch(employee_id, employee_id, action, now, None) for employee_id in employee_ids if employee_id in employees
+    ]
+    try:
+        results = apply_punches(punches)
+    except IntegrityError:
+        return {"message": "Conflicting concurrent update, please retry."}, 409
+
+    return {
+        "results": {
+            employee_id: results.get(employee_id, PunchResult('error', "Employee not found."))._asdict()
+            for employee_id in employee_ids
+        }
+    }, 200
+
+
 class AdminCheckInOutView(APIView):
+    """
+    Checks one ``employee_id`` in or out, or many at once when
+    ``employee_ids`` or ``group`` is given instead.
+    """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        print(request)
         # Ensure the user is an admin
         if request.user.role != 'admin':
             return Response({"message": "Permission denied."}, status=403)
 
+        if 'employee_ids' in request.data or 'group' in request.data:
+            payload, status_code = bulk_admin_check(request.data)
+            return Response(payload, status=status_code)
+
         # Retrieve the employee ID and action (check-in or check-out) from the request
         employee_id = request.data.get('employee_id')
         action = request.data.get('action')
@@ -215,23 +294,22 @@ class AdminCheckInOutView(APIView):
         except User.DoesNotExist:
             return Response({"message": "Employee not found."}, status=404)
 
-        # Check if there's already a record for today
-        try:
-            attendance = Attendance.objects.filter(
-                employee=employee,
-                checkin_time__date=timezone.now().date()
-            ).latest('checkin_time')
-        except Attendance.DoesNotExist:
-            attendance = None
+        # Check if there's already a record for the current shift
+        now = timezone.now()
+        work_date = ExpectedPresence.work_date_for(employee.id, now)
+        attendance = Attendance.objects.filter(employee=employee, work_date=work_date).first()
 
         if action == 'check_in':
             # If the admin is trying to check-in the user
             if attendance and attendance.checkin_time:
                 return Response({"message": "The user is already checked in today!"}, status=400)
-            else:
+            try:
                 # Create a new check-in record
-                Attendance.objects.create(employee=employee, checkin_time=timezone.now())
-                return Response({"message": "Check-in successful!"})
+                with transaction.atomic():
+                    Attendance.objects.create(employee=employee, work_date=work_date, checkin_time=now)
+            except IntegrityError:
+                return Response({"message": "The user is already checked in today!"}, status=400)
+            return Response({"message": "Check-in successful!"})
 
         elif action == 'check_out':
             # If the admin is trying to check-out the user
@@ -241,16 +319,293 @@ class AdminCheckInOutView(APIView):
                 return Response({"message": "No check-in record found for today!"}, status=400)
             else:
                 # Update the existing record with the checkout time
-                attendance.checkout_time = timezone.now()
+                attendance.checkout_time = now
                 attendance.save()
                 return Response({"message": "Check-out successful!"})
 
 
+USER_LIST_CACHE_KEY = 'users:list:{}'
+
+
+def user_list_etag(request, *args, **kwargs):
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return f"{get_version(USERS_VERSION_KEY)}-{query}"
+
+
+def user_list_last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(get_version(USERS_VERSION_KEY) / 1e9, tz=dt_timezone.utc)
+
+
 class UserListView(APIView):
+    """
+    Lists users with optional ``?fields=`` projection, ``?search=`` on the
+    name and ``?role=`` filtering. Passing ``page_size`` or ``cursor``
+    switches to cursor pagination. Responses are cached per users version,
+    and conditional requests for an unchanged list get a 304.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = UserCursorPagination
+
+    @method_decorator(condition(etag_func=user_list_etag, last_modified_func=user_list_last_modified))
+    def get(self, request):
+        cache_key = USER_LIST_CACHE_KEY.format(user_list_etag(request))
+        data = cache.get(cache_key)
+        if data is None:
+            fields = UserSerializer.Meta.fields
+            if request.query_params.get('fields'):
+                fields = request.query_params['fields'].split(',')
+                unknown = set(fields) - set(UserSerializer.Meta.fields)
+                if unknown:
+                    return Response({"message": f"Unknown fields: {', '.join(sorted(unknown))}."}, status=400)
+                # The cursor position is taken from the id, so it is always selected
+                fields = ['id'] + [field for field in fields if field != 'id']
+
+            users = User.objects.order_by('id')
+            search = request.query_params.get('search')
+            if search:
+                users = users.filter(Q(first_name__icontains=search) | Q(last_name__icontains=search))
+            role = request.query_params.get('role')
+            if role:
+                users = users.filter(role=role)
+            users = users.values(*fields)
+
+            if 'page_size' in request.query_params or 'cursor' in request.query_params:
+                paginator = self.pagination_class()
+                page = paginator.paginate_queryset(users, request, view=self)
+                data = paginator.get_paginated_response(page).data
+            else:
+                data = list(users)
+            cache.set(cache_key, data, timeout=settings.USER_LIST_CACHE_TIMEOUT)
+        return Response(data)
+
+
+class MyAttendanceView(APIView):
+    """The caller's own attendance records, newest first, in cursor pages."""
+    permission_classes = [IsAuthenticated]
+    pagination_class = AttendanceCursorPagination
+
+    def get(self, request):
+        records = Attendance.objects.filter(employee_id=request.user.id, checkin_time__isnull=False).values(
+            'id', 'work_date', 'checkin_time', 'checkout_time', 'office_id'
+        )
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(records, request, view=self)
+        return paginator.get_paginated_response(page)
+
+
+class MySummaryView(APIView):
+    """The caller's totals for ``?month=YYYY-MM``, the current month by default."""
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        # Fetch all users from the database
-        users = User.objects.all()
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        month = request.query_params.get('month')
+        if month:
+            try:
+                month_start = timezone.datetime.strptime(month, "%Y-%m").date()
+            except ValueError:
+                return Response({"message": "month must be in YYYY-MM format."}, status=400)
+        else:
+            month_start = timezone.localdate().replace(day=1)
+        return Response(monthly_summary(request.user.id, month_start))
+
+
+class NotificationListView(APIView):
+    """
+    Notifications with ids after ``?after=``, oldest first, up to ``?limit=``.
+    Admins see everyone's, employees their own. Clients poll with the
+    returned ``last_id``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            after = int(request.query_params.get('after', 0))
+            limit = min(int(request.query_params.get('limit', 100)), settings.NOTIFICATIONS_MAX_PAGE_SIZE)
+        except ValueError:
+            return Response({"message": "after and limit must be integers."}, status=400)
+
+        notifications = Notification.objects.filter(id__gt=after)
+        if request.user.role != 'admin':
+            notifications = notifications.filter(employee_id=request.user.id)
+        notifications = list(
+            notifications.order_by('id').values('id', 'employee_id', 'kind', 'date', 'message', 'created_at')[:limit]
+        )
+        last_id = notifications[-1]['id'] if notifications else after
+        return Response({"notifications": notifications, "last_id": last_id})
+
+
+class BulkPunchView(APIView):
+    """
+    Accepts a batch of queued check-in/check-out events, e.g. from a kiosk
+    gateway or a client that was offline, and returns a result per event.
+    Employees may only submit their own punches from the last
+    ``BULK_PUNCH_MAX_AGE``; admins may backfill any.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        events = request.data.get('events')
+        if not isinstance(events, list) or not events:
+            return Response({"message": "A non-empty list of events is required."}, status=400)
+        if len(events) > settings.BULK_PUNCH_MAX_EVENTS:
+            return Response(
+                {"message": f"At most {settings.BULK_PUNCH_MAX_EVENTS} events are accepted per request."},
+                status=400,
+            )
+
+        is_admin = request.user.role == 'admin'
+        now = timezone.now()
+        latest_allowed = now + settings.BULK_PUNCH_CLOCK_SKEW
+        earliest_allowed = None if is_admin else now - settings.BULK_PUNCH_MAX_AGE
+        results, valid = {}, []
+        for index, event in enumerate(events):
+            serializer = PunchSerializer(data=event)
+            if not serializer.is_valid():
+                results[index] = PunchResult('error', serializer.errors)
+                continue
+            data = serializer.validated_data
+            employee_id = data.get('employee_id', request.user.id)
+            if employee_id != request.user.id and not is_admin:
+                results[index] = PunchResult('error', "Permission denied.")
+            elif data['timestamp'] > latest_allowed:
+                results[index] = PunchResult('error', "Timestamp is in the future.")
+            elif earliest_allowed is not None and data['timestamp'] < earliest_allowed:
+                results[index] = PunchResult('error', "Timestamp is too old; ask an admin for a correction.")
+            else:
+                valid.append((index, employee_id, data))
+
+        known_ids = set(
+            User.objects.filter(id__in={employee_id for _, employee_id, _ in valid}).values_list('id', flat=True)
+        )
+        offices = find_offices([data['latitude'] for _, _, data in valid], [data['longitude'] for _, _, data in valid])
+
+        punches = []
+        for (index, employee_id, data), office in zip(valid, offices):
+            if employee_id not in known_ids:
+                results[index] = PunchResult('error', "Employee not found.")
+            elif office is None:
+                results[index] = PunchResult('error', "Too far from the office.")
+            else:
+                punches.append(Punch(index, employee_id, data['action'], data['timestamp'], office.office_id))
+
+        try:
+            results.update(apply_punches(punches))
+        except IntegrityError:
+            # Another request stored a check-in for one of these days in the meantime
+            return Response({"message": "Conflicting concurrent update, please retry."}, status=409)
+
+        return Response({
+            "results": [
+                {"index": index, "status": results[index].status, "message": results[index].message}
+                for index in range(len(events))
+            ]
+        })
+
+
+class MetricsView(APIView):
+    """
+    Request metrics in the Prometheus text format, of every worker when
+    ``PROMETHEUS_MULTIPROC_DIR`` is set, readable from the addresses in
+    ``METRICS_ALLOWED_IPS``.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+            return Response({"message": "Permission denied."}, status=403)
+        return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+
+class PresenceView(APIView):
+    """Who is in the office today: every employee's status, with counts."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({"message": "Permission denied."}, status=403)
+        return Response(board.sync().snapshot())
+
+
+class PresenceStreamView(APIView):
+    """Server-sent events with a presence snapshot followed by each change."""
+    permission_classes = [IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # EventSource clients only accept text/event-stream, which no DRF renderer produces
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({"message": "Permission denied."}, status=403)
+
+        last_event_id = request.headers.get('Last-Event-ID')
+        # Under ASGI the stream waits on the event loop instead of holding a thread
+        stream = apresence_stream if settings.ATTENDANCE_ASYNC_VIEWS else presence_stream
+        response = StreamingHttpResponse(stream(last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class ReportJobCreateView(APIView):
+    """Queues a report for background generation."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role != 'admin':
+            return Response({"message": "Permission denied."}, status=403)
+
+        date_range = parse_report_range(request.data)
+        if isinstance(date_range, Response):
+            return date_range
+
+        report_format = request.data.get('format', 'xlsx')
+        if report_format not in REPORT_FORMATS:
+            return Response(
+                {"message": f"format must be one of: {', '.join(REPORT_FORMATS)}."}, status=400
+            )
+
+        job = enqueue_report(*date_range, report_format, requested_by_id=request.user.id)
+        return Response(report_job_data(job), status=200 if job.status == 'done' else 202)
+
+
+class ReportJobDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        if request.user.role != 'admin':
+            return Response({"message": "Permission denied."}, status=403)
+        try:
+            job = ReportJob.objects.get(pk=job_id)
+        except ReportJob.DoesNotExist:
+            return Response({"message": "Report job not found."}, status=404)
+        return Response(report_job_data(job))
+
+
+class ReportJobDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        if request.user.role != 'admin':
+            return Response({"message": "Permission denied."}, status=403)
+        try:
+            job = ReportJob.objects.get(pk=job_id, status='done')
+            return artifact_response(job.file_path, job.start_date, job.end_date, job.format)
+        except (ReportJob.DoesNotExist, OSError):
+            return Response({"message": "Report is not ready."}, status=404)
+
+
+def report_job_data(job):
+    data = {
+        "job_id": job.pk,
+        "status": job.status,
+        "start_date": job.start_date,
+        "end_date": job.end_date,
+        "format": job.format,
+    }
+    if job.status == 'done':
+        data["download_url"] = reverse('report-job-download', args=[job.pk])
+    elif job.status == 'failed':
+        data["error"] = job.error
+    return data
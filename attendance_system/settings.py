@@ -14,7 +14,7 @@ from pathlib import Path
 import os
 import os.path  
 import sys
-from datetime import timedelta
+from datetime import time, timedelta
 
 PROJECT_ROOT = os.path.normpath(os.path.dirname(__file__))
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'attendance.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,9 +90,22 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+if os.getenv('DB_POOL') == '1':
+    # psycopg 3 connection pool; persistent connections must be off when pooling
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': 10,
+        },
+    }
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
@@ -113,10 +127,29 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'attendance.User'
 
+# The selected hasher hashes new passwords; the others still verify older hashes,
+# which are replaced on the next successful login. See manage.py benchmark_login.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'argon2')
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '19456'))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '1'))
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+_PASSWORD_HASHERS = {
+    'argon2': 'attendance.hashers.TunedArgon2PasswordHasher',
+    'bcrypt': 'attendance.hashers.TunedBCryptSHA256PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'attendance.authentication.StatelessJWTAuthentication',
     ),
+    'DEFAULT_THROTTLE_RATES': {
+        'login': os.getenv('LOGIN_THROTTLE_RATE', '10/min'),  # Per login name
+    },
 }
 
 # JWT settings (optional)
@@ -124,10 +157,85 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     'ACCESS_TOKEN_LIFETIME': timedelta(days=300),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=300),
+    'TOKEN_USER_CLASS': 'attendance.authentication.AttendanceTokenUser',
 }
 
 OFFICE_LATITUDE = 41.292213 # Example: Latitude of the office
 OFFICE_LONGITUDE = 69.211619 # Example: Longitude of the office
+OFFICE_RADIUS = 0.5  # in kilometers, used until an OfficeLocation is configured
+
+# Working time rules used by the daily attendance summaries
+ATTENDANCE_SHIFT_START = time(9, 0)
+ATTENDANCE_LATE_GRACE = timedelta(minutes=5)
+ATTENDANCE_WORKDAYS = (0, 1, 2, 3, 4)  # Monday to Friday
+ATTENDANCE_STANDARD_DAY = timedelta(hours=8)  # Time worked beyond this counts as overtime
+# Employees with a Schedule are expected per the generated calendar instead of the defaults above
+ATTENDANCE_CALENDAR_DAYS = 60  # Days ahead kept in the expected-presence calendar
+ATTENDANCE_SHIFT_MATCH_WINDOW = timedelta(hours=3)  # How far outside a shift a punch still belongs to it
+
+# Every worker process must share the cache: token versions, throttles, idempotency keys,
+# presence events and version counters live there. Without REDIS_URL each process keeps
+# its own in-memory cache, which only suits a single-process development server.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+
+# Cached token versions expire, so a missed invalidation cannot keep a revoked token alive for long
+TOKEN_VERSION_CACHE_TIMEOUT = 5 * 60
+
+# Cached /api/users/ responses; entries are also replaced whenever a user changes
+USER_LIST_CACHE_TIMEOUT = 60 * 60
+
+# Replayed check-in/check-out responses for retried requests carrying an Idempotency-Key.
+IDEMPOTENCY_CACHE = os.getenv('IDEMPOTENCY_CACHE', 'default')
+IDEMPOTENCY_KEY_TTL = 10 * 60
+
+# Live presence (/api/presence/ and its server-sent events stream), in seconds
+PRESENCE_POLL_INTERVAL = 1
+PRESENCE_STREAM_TIMEOUT = 5 * 60  # Streams are closed after this; clients reconnect
+PRESENCE_RETRY_MS = 2000
+
+# Route check-in/check-out and admin check to the async views (set when served over ASGI)
+ATTENDANCE_ASYNC_VIEWS = os.getenv('ATTENDANCE_ASYNC_VIEWS') == '1'
+
+# Background report generation (manage.py run_report_worker)
+REPORT_STORAGE_DIR = os.getenv('REPORT_STORAGE_DIR', os.path.join(BASE_DIR, 'report_artifacts'))
+REPORT_JOB_TIMEOUT = timedelta(hours=1)  # Running jobs older than this are requeued
+
+# Monthly range partitioning of attendance on PostgreSQL (manage.py partition_attendance).
+# When set, migrating a new database creates the table partitioned.
+ATTENDANCE_PARTITIONING = os.getenv('ATTENDANCE_PARTITIONING') == '1'
+ATTENDANCE_PARTITION_MONTHS_AHEAD = 3
+ATTENDANCE_PARTITION_HOT_MONTHS = 13  # Older closed years are folded into one archive partition each
+ATTENDANCE_RETENTION_YEARS = None  # Archives older than this many years are dropped; summaries are kept
+
+# Request instrumentation (/api/metrics/)
+SLOW_REQUEST_THRESHOLD_MS = int(os.getenv('SLOW_REQUEST_THRESHOLD_MS', '500'))
+METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1').split(',')
+
+# Bulk punch upload (/api/attendance/bulk/)
+BULK_PUNCH_MAX_EVENTS = 500
+BULK_PUNCH_CLOCK_SKEW = timedelta(minutes=5)  # Tolerated device clock drift into the future
+BULK_PUNCH_MAX_AGE = timedelta(days=7)  # Older punches are corrections, left to admins
+
+# Bulk admin check-in/out (/api/admin/check/ with employee_ids or group)
+ADMIN_BULK_CHECK_MAX_EMPLOYEES = 1000
+
+# Absence and missing check-out detection (manage.py run_scheduler), at these local times
+ATTENDANCE_SCHEDULE_TIMES = tuple(
+    time.fromisoformat(value) for value in os.getenv('ATTENDANCE_SCHEDULE_TIMES', '10:00,20:00').split(',')
+)
+# Sessions open longer than this are closed at check-in plus ATTENDANCE_STANDARD_DAY; None keeps them open
+ATTENDANCE_AUTO_CLOSE_AFTER = timedelta(hours=16)
+NOTIFICATIONS_MAX_PAGE_SIZE = 500
+
+# Admin changelists of larger unfiltered tables show the planner's row estimate instead of COUNT(*)
+ADMIN_EXACT_COUNT_LIMIT = 100000
 
 # Example: For UTC time
 TIME_ZONE = 'UTC'
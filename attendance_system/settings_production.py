@@ -0,0 +1,67 @@
+"""
+Production settings: DEBUG off, static files served precompressed by
+WhiteNoise, a Redis cache shared by all processes, cached templates and
+the browser-only middleware skipped on the JWT API. Selected with DJANGO_SETTINGS_MODULE=attendance_system.settings_production.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '*').split(',')
+
+# One cache for all workers and the scheduler and report-worker processes: the geofence
+# index version, user list cache, Idempotency-Key dedup, presence events, login throttle
+# and token versions are only consistent when every process sees the same entries
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/0'),
+    },
+}
+IDEMPOTENCY_CACHE = 'default'
+
+# Sessions, CSRF, auth, messages and clickjacking protection only matter for the admin
+BROWSER_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+API_PATH_PREFIX = '/api/'
+MIDDLEWARE = [
+    'attendance.middleware.InstrumentationMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'attendance.middleware.BrowserOnlyMiddleware',
+]
+# The admin checks look for these in MIDDLEWARE; BrowserOnlyMiddleware runs them for the admin
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # Hashed names and gzip copies written by collectstatic, served with far-future caching
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+# Served over ASGI by gunicorn with uvicorn workers (gunicorn.conf.py)
+ATTENDANCE_ASYNC_VIEWS = os.getenv('ATTENDANCE_ASYNC_VIEWS', '1') == '1'
@@ -15,14 +15,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 
+# Static files are served by runserver in development and by WhiteNoise in production
 urlpatterns = [
     path('api/', include('attendance.urls')),
     path('admin/', admin.site.urls)
 ]
-
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -0,0 +1,33 @@
+# Gunicorn configuration: uvicorn workers serving the ASGI application
+import multiprocessing
+import os
+import shutil
+
+wsgi_app = 'attendance_system.asgi:application'
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+# Async workers do not block on I/O, so one per core absorbs the check-in spike
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = '-'
+
+# Workers share request metrics through files here; set before the workers import prometheus_client
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/attendance-metrics')
+
+
+def on_starting(server):
+    # Samples of a previous run would be added to this one's
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)